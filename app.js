@@ -72,6 +72,66 @@ document.addEventListener('DOMContentLoaded', () => {
     }
   });
 
+  // Canonical Huffman compression of the same text, round-tripped on the server
+  bind('hufCompressBtn', 'click', async () => {
+    const input = $('hufInput');
+    const box = $('hufCompressBox');
+    try {
+      const response = await fetch('/api/greedy/huffman/encode', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ text: input ? input.value : '', verify: true }),
+      });
+      const resp = await response.json();
+      if (resp.error) throw new Error(resp.error);
+
+      const vis = $('g-huf-vis');
+      if (vis) vis.style.display = 'block';
+      if (box) {
+        box.textContent = [
+          `Original: ${resp.originalBytes} bytes | Compressed: ${resp.compressedBytes} bytes`
+            + (resp.ratio !== null ? ` (ratio ${resp.ratio}, ${resp.averageBits} bits/symbol)` : ''),
+          `Longest code: ${resp.maxCodeLength} bits | Round trip: ${resp.verified ? 'ok' : 'FAILED'}`,
+          `Encode: ${resp.encodeMs} ms (${resp.throughputMBs ?? '-'} MB/s) | Decode: ${resp.decodeMs} ms (${resp.decodeThroughputMBs ?? '-'} MB/s)`
+        ].join('\n');
+      }
+    } catch (err) {
+      console.error('Huffman compression failed:', err);
+      if (box) box.textContent = `Error: ${err.message}`;
+    }
+  });
+
+  // Large files go up as a raw body and are compressed in two streaming passes
+  bind('hufFileBtn', 'click', async () => {
+    const fileInput = $('hufFile');
+    const box = $('hufCompressBox');
+    const file = fileInput && fileInput.files[0];
+    if (!file) return;
+    try {
+      const response = await fetch('/api/greedy/huffman/stream?summary=1', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/octet-stream' },
+        body: file,
+      });
+      const resp = await response.json();
+      if (resp.error) throw new Error(resp.error);
+
+      const vis = $('g-huf-vis');
+      if (vis) vis.style.display = 'block';
+      if (box) {
+        box.textContent = [
+          `${file.name}: ${resp.originalBytes} bytes -> ${resp.compressedBytes} bytes`
+            + (resp.ratio !== null ? ` (ratio ${resp.ratio}, ${resp.averageBits} bits/symbol)` : ''),
+          `Longest code: ${resp.maxCodeLength} bits | Count: ${resp.countMs} ms | Encode: ${resp.encodeMs} ms`
+            + ` | ${resp.throughputMBs ?? '-'} MB/s`
+        ].join('\n');
+      }
+    } catch (err) {
+      console.error('Huffman file compression failed:', err);
+      if (box) box.textContent = `Error: ${err.message}`;
+    }
+  });
+
   $$('button').forEach(btn => { if (!btn.type) btn.type = 'button'; });
 
   window.addEventListener('error', (e) => {
@@ -113,6 +173,76 @@ if (location.protocol === 'file:') {
   }, 100);
 }
 
+// =================== ALGORITHM CATALOG ===================
+// /api/algorithms drives the sort, cipher and "more" menus. Options the browser
+// runs by itself are kept, and the static markup stays if the backend is down.
+let algorithmCatalog = null;
+const CLIENT_ONLY_ALGOS = { sortAlgo: ['tree', 'tournament'], moreAlgo: ['gcd', 'lcm', 'fibonacci', 'factorial'] };
+
+function syncAlgoMenu(id, entries){
+  const sel = $(id);
+  if (!sel || !entries) return;
+  const selected = sel.value;
+  const clientOnly = (CLIENT_ONLY_ALGOS[id] || [])
+    .map(v => sel.querySelector(`option[value="${v}"]`))
+    .filter(Boolean);
+  sel.innerHTML = '';
+  for (const entry of entries){
+    const opt = document.createElement('option');
+    opt.value = entry.name;
+    opt.textContent = entry.label;
+    opt.title = entry.complexity + (entry.maxN ? `, up to ${entry.maxN} elements` : '');
+    sel.appendChild(opt);
+  }
+  clientOnly.forEach(opt => sel.appendChild(opt));
+  if (Array.from(sel.options).some(o => o.value === selected)) sel.value = selected;
+}
+
+async function loadAlgorithmCatalog(){
+  try {
+    const res = await fetch(API_BASE + '/api/algorithms');
+    if (!res.ok) return;
+    algorithmCatalog = await res.json();
+  } catch (err) {
+    return;
+  }
+  syncAlgoMenu('sortAlgo', algorithmCatalog.sort);
+  syncAlgoMenu('cryptoAlgo', algorithmCatalog.crypto);
+  syncAlgoMenu('moreAlgo', algorithmCatalog.more);
+}
+
+// Largest input the server accepts for an algorithm, or null when unknown/unbounded
+function algoInputLimit(category, name){
+  const entry = algorithmCatalog?.[category]?.find(e => e.name === name);
+  return entry?.maxN ?? null;
+}
+
+// Same, for background jobs, which accept larger inputs than a single request
+function algoJobLimit(category, name){
+  const entry = algorithmCatalog?.[category]?.find(e => e.name === name);
+  return entry?.jobMaxN ?? entry?.maxN ?? null;
+}
+
+if (location.protocol !== 'file:') loadAlgorithmCatalog();
+
+// =================== JOBS ===================
+// Starts a server-side job and polls it until it finishes; onProgress gets each progress snapshot
+const JOB_POLL_MS = 500;
+const CRYPTO_JOB_MIN_CHARS = 20000;
+
+async function runJob(body, onProgress){
+  let job = await apiPost('/api/jobs', body);
+  while (job.status === 'queued' || job.status === 'running' || job.status === 'cancelling') {
+    await new Promise(resolve => setTimeout(resolve, JOB_POLL_MS));
+    const res = await fetch(`${API_BASE}/api/jobs/${job.id}`);
+    job = await res.json();
+    if (!res.ok) throw new Error(job.error || `HTTP ${res.status}`);
+    if (onProgress) onProgress(job.progress);
+  }
+  if (job.status !== 'done') throw new Error(job.error || `Job ${job.status}`);
+  return job.result;
+}
+
 /* -------- Section switching -------- */
 const sections = {
   sort: { settings: 'sortSettings', vis: 'sortVis' },
@@ -167,6 +297,7 @@ function initializeGreedyAlgorithms() {
   if (activityStartBtn) {
     activityStartBtn.addEventListener('click', async () => {
       const input = $('activityInput').value;
+      const mode = $('activityMode') ? $('activityMode').value : 'select';
       const resultBox = $('g-activity-result');
       const stepsBox = $('g-activity-steps');
       
@@ -174,7 +305,7 @@ function initializeGreedyAlgorithms() {
         const response = await fetch('/api/greedy/activity', {
           method: 'POST',
           headers: { 'Content-Type': 'application/json' },
-          body: JSON.stringify({ activities: input })
+          body: JSON.stringify({ activities: input, mode })
         });
         
         if (!response.ok) throw new Error(`HTTP error! status: ${response.status}`);
@@ -182,7 +313,12 @@ function initializeGreedyAlgorithms() {
         
         if (result.error) throw new Error(result.error);
         
-        resultBox.textContent = `Selected Activities: ${result.selected.join(', ')} | Count: ${result.count}`;
+        if (mode === 'rooms') {
+          resultBox.textContent = `Rooms needed: ${result.rooms} | Room per activity: ${result.assignment.map(r => r + 1).join(', ')}`;
+        } else {
+          resultBox.textContent = `Selected Activities: ${result.selected.join(', ')} | Count: ${result.count}`
+            + (mode === 'weighted' ? ` | Total weight: ${result.totalWeight}` : '');
+        }
         stepsBox.textContent = result.steps ? result.steps.join('\n') : 'No detailed steps available';
       } catch (err) {
         console.error('Activity selection failed:', err);
@@ -198,6 +334,7 @@ function initializeGreedyAlgorithms() {
     knapStartBtn.addEventListener('click', async () => {
       const items = $('knapItems').value;
       const capacity = $('knapCapacity').value;
+      const engine = $('knapEngine') ? $('knapEngine').value : 'greedy';
       const resultBox = $('g-knap-result');
       const stepsBox = $('g-knap-steps');
       
@@ -205,7 +342,7 @@ function initializeGreedyAlgorithms() {
         const response = await fetch('/api/greedy/knapsack', {
           method: 'POST',
           headers: { 'Content-Type': 'application/json' },
-          body: JSON.stringify({ items, capacity: parseInt(capacity) })
+          body: JSON.stringify({ items, capacity: parseInt(capacity), engine })
         });
         
         if (!response.ok) throw new Error(`HTTP error! status: ${response.status}`);
@@ -214,6 +351,10 @@ function initializeGreedyAlgorithms() {
         if (result.error) throw new Error(result.error);
         
         resultBox.textContent = `Max Value: ${result.maxValue} | Selected Items: ${result.selectedItems.join(', ')}`;
+        if (result.engine) {
+          resultBox.textContent += ` | Greedy: ${result.greedyValue} | ${result.engine} in ${result.timeMs} ms, `
+            + `${(result.memoryBytes / 1024).toFixed(1)} KB${result.optimal ? '' : ' (not proven optimal)'}`;
+        }
         stepsBox.textContent = result.steps ? result.steps.join('\n') : 'No detailed steps available';
       } catch (err) {
         console.error('Knapsack failed:', err);
@@ -1360,13 +1501,98 @@ if (sortStartBtn) sortStartBtn.addEventListener('click', async ()=>{
   if (algo === 'tournament'){ await runTournamentSort(arr); return; }
   if (algo === 'heap'){ await runHeapSortVisual(arr); return; }
   if (algo === 'tree'){ await runTreeSortVisual(arr); return; }
+  const limit = algoInputLimit('sort', algo);
+  if (limit && arr.length > limit) { alert(`${algo} sort accepts at most ${limit} numbers`); return; }
   buildBars(arr);
-  const res = await apiPost('/api/sort', { algo, array: arr });
-  await playOps(res.ops, algo);
+  try {
+    if (arr.length > FRAME_BUDGET_MIN_N){
+      const res = await apiPost('/api/sort', { algo, array: arr, maxFrames: SORT_MAX_FRAMES });
+      await playOps(res.ops, algo);
+      const c = res.counts;
+      addSortStep(`Coalesced ${c.totalOps} ops into ${res.frameCount} frames: ${c.comparisons} compares, ${c.swaps} swaps, ${c.writes} writes`);
+      if (res.truncated) addSortStep(truncationNote(res.truncatedBy, c.totalOps));
+      return;
+    }
+    await playOps(streamSortOps({ algo, array: arr, format: 'packed' }), algo);
+  } catch (err) {
+    addSortStep(`Error: ${err.message}`);
+  }
 });
 
+// The server stops a sort that runs past its time budget or op ceiling and sends what it has
+function truncationNote(reason, count){
+  const why = reason === 'deadline' ? 'the server time budget ran out' : 'the trace hit the op limit';
+  return `Trace truncated after ${count} ops: ${why}. The bars are not fully sorted.`;
+}
 
+// Above this many bars individual ops are not watchable, so ask the server for frames
+const FRAME_BUDGET_MIN_N = 200;
+const SORT_MAX_FRAMES = 2000;
 
+// Reads the NDJSON trace from /api/sort and yields ops as each chunk arrives
+async function* streamSortOps(body){
+  const res = await fetch(API_BASE + '/api/sort', {
+    method:'POST',
+    headers:{'Content-Type':'application/json'},
+    body: JSON.stringify({ ...body, mode: 'stream' })
+  });
+  if (!res.ok) {
+    const errorText = await res.text();
+    throw new Error(`HTTP ${res.status}: ${errorText}`);
+  }
+  const reader = res.body.getReader();
+  const decoder = new TextDecoder();
+  let buf = '';
+  while (true){
+    const { value, done } = await reader.read();
+    if (done) break;
+    buf += decoder.decode(value, { stream: true });
+    let nl;
+    while ((nl = buf.indexOf('\n')) >= 0){
+      const line = buf.slice(0, nl);
+      buf = buf.slice(nl + 1);
+      if (!line) continue;
+      const msg = JSON.parse(line);
+      if (msg.error) throw new Error(msg.error);
+      if (msg.done && msg.truncated) addSortStep(truncationNote(msg.truncatedBy, msg.count));
+      if (msg.trace) yield* decodePackedTrace(msg.trace);
+      else if (msg.ops) yield* msg.ops;
+    }
+  }
+}
+
+// Packed traces ship each op field as a base64 typed-array column
+const TRACE_ARRAY_TYPES = { uint8: Uint8Array, int8: Int8Array, int16: Int16Array, int32: Int32Array, float64: Float64Array };
+
+function decodeTraceColumn(col){
+  const bin = atob(col.data);
+  const bytes = new Uint8Array(bin.length);
+  for (let k=0;k<bin.length;k++) bytes[k] = bin.charCodeAt(k);
+  return new TRACE_ARRAY_TYPES[col.dtype](bytes.buffer);
+}
+
+function decodePackedTrace(trace){
+  const names = trace.opNames;
+  const codes = decodeTraceColumn(trace.columns.op);
+  const first = decodeTraceColumn(trace.columns.i);
+  const second = decodeTraceColumn(trace.columns.j);
+  const gaps = trace.columns.gap ? decodeTraceColumn(trace.columns.gap) : null;
+  const ops = new Array(trace.count);
+  for (let k=0;k<trace.count;k++){
+    const type = names[codes[k]];
+    let op;
+    if (type === 'gap_change') op = { type, gap: gaps[k] };
+    else if (type === 'set' || type === 'pivot') op = { type, i: first[k], value: second[k] };
+    else op = { type, i: first[k], j: second[k] };
+    if (gaps && gaps[k] && type !== 'gap_change') op.gap = gaps[k];
+    ops[k] = op;
+  }
+  return ops;
+}
+
+
+
+// ops may be an array or an async iterable of ops (streamed traces)
 async function playOps(ops, algo){
   function barsList(){ return Array.from(barsArea.children); }
   
@@ -1502,35 +1728,25 @@ async function playOps(ops, algo){
   if (algo === 'tim') {
     addSortStep(`Unsorted Array: [${currentArray.join(', ')}]`);
     
-    // Divide into runs (simplified - 4 elements per run)
+    // Same minrun rule as the server: top six bits of n, plus one if any lower bit is set
+    let m = currentArray.length, r = 0;
+    while (m >= 64) { r |= m & 1; m >>= 1; }
+    const minrun = m + r;
+    addSortStep(`minrun = ${minrun}: shorter natural runs are extended with binary insertion sort`);
+    
+    // Natural runs: non-descending, or strictly descending (reversed in place)
     const runs = [];
-    for (let i = 0; i < currentArray.length; i += 4) {
-      runs.push(currentArray.slice(i, i + 4));
+    let lo = 0;
+    while (lo < currentArray.length) {
+      let hi = lo + 1;
+      const desc = hi < currentArray.length && currentArray[hi] < currentArray[lo];
+      while (hi < currentArray.length && (desc ? currentArray[hi] < currentArray[hi-1] : currentArray[hi] >= currentArray[hi-1])) hi++;
+      runs.push(`[${currentArray.slice(lo, hi).join(', ')}]${desc ? ' (descending → reverse)' : ''}`);
+      lo = hi;
     }
-    
-    addSortStep(`Divide array into runs ${runs.map(run => `[${run.join(', ')}]`).join(' ')}`);
-    
-    // Show insertion sort for each run
-    runs.forEach((run, index) => {
-      addSortStep(`Sort Run ${index + 1} using insertion sort`);
-      addSortStep(`[${run.join(', ')}]`);
-      
-      // Simulate insertion sort steps for this run
-      const sortedRun = [...run].sort((a, b) => a - b);
-      for (let i = 1; i < run.length; i++) {
-        const current = run[i];
-        let j = i - 1;
-        while (j >= 0 && run[j] > current) {
-          addSortStep(`[${run.join(', ')}] | ${run[j]} > ${current} swap`);
-          j--;
-        }
-      }
-      addSortStep(`Sorted Run ${index + 1}: [${sortedRun.join(', ')}]`);
-    });
-    
-    addSortStep(`Merge Runs`);
-    const finalSorted = [...currentArray].sort((a, b) => a - b);
-    addSortStep(`[${finalSorted.join(', ')}]`);
+    addSortStep(`Natural runs: ${runs.join(' ')}`);
+    addSortStep(`Runs are pushed on a stack and merged while keeping A > B + C and B > C`);
+    addSortStep(`Merges switch to galloping when one run keeps winning comparisons`);
   }
   
   if (algo === 'quick') {
@@ -1554,7 +1770,9 @@ async function playOps(ops, algo){
   }
   
   // Process operations
-  for (const op of ops){
+  let opCount = 0;
+  for await (const op of ops){
+    opCount++;
     incSortStep();
     const bl = barsList();
     bl.forEach(b=>b.classList.remove('compare','swap','gap-highlight','active','min-candidate'));
@@ -1679,6 +1897,19 @@ async function playOps(ops, algo){
       }
     }
     else if (algo === 'quick') {
+      if (op.type === 'pivot') {
+        bl[op.i]?.classList.add('active');
+        addSortStep(`Choose pivot ${op.value} at position ${op.i}`);
+      }
+      
+      if (op.type === 'partition') {
+        bl[op.i]?.classList.add('active');
+        bl[op.j]?.classList.add('active');
+        addSortStep(op.i === op.j
+          ? `[${currentArray.join(', ')}] | Pivot placed at position ${op.i}`
+          : `[${currentArray.join(', ')}] | Pivot block placed at positions ${op.i}..${op.j}`);
+      }
+      
       if (op.type === 'compare') {
         bl[op.i]?.classList.add('compare');
         bl[op.j]?.classList.add('compare');
@@ -1766,6 +1997,22 @@ async function playOps(ops, algo){
       }
     }
     
+    // Budgeted traces coalesce many ops into one frame of index/value writes
+    if (op.type==='frame'){
+      let maxVal = 1;
+      for (const v of readBars()) if (v > maxVal) maxVal = v;
+      for (const v of op.values) if (v > maxVal) maxVal = v;
+      op.i.forEach((idx, k) => {
+        const el = bl[idx];
+        if (!el) return;
+        const v = op.values[k];
+        el.classList.add('swap');
+        el.dataset.val = v;
+        el.style.height = Math.max(8, (v/maxVal)*100) + '%';
+        el.innerText = String(v);
+      });
+    }
+    
     if (['heap','tree'].includes(algo)) updateTreeCanvasFromBars();
     await sleep(delay);
   }
@@ -1776,7 +2023,7 @@ async function playOps(ops, algo){
   addSortStep(``);
   addSortStep(`=== SORTING COMPLETED ===`);
   addSortStep(`Final sorted array: [${readBars().join(', ')}]`);
-  addSortStep(`Total operations performed: ${ops.length}`);
+  addSortStep(`Total operations performed: ${opCount}`);
   
   if (algo === 'shell' || algo === 'comb') {
     addSortStep(`Gap sequence used: [${gapSequence.join(', ')}]`);
@@ -4015,6 +4262,13 @@ async function runCryptoAlgorithm(operation) {
   const stepsBox = $('cryptoSteps');
   const detailsBox = $('cryptoDetails');
   
+  const limit = algoInputLimit('crypto', algo);
+  const jobLimit = algoJobLimit('crypto', algo);
+  if (jobLimit && input.length > jobLimit) {
+    resultBox.textContent = `Error: ${algo} accepts at most ${jobLimit} characters`;
+    return;
+  }
+  
   resultBox.textContent = 'Processing...';
   stepsBox.textContent = '';
   detailsBox.textContent = '';
@@ -4036,19 +4290,29 @@ async function runCryptoAlgorithm(operation) {
     
     console.log('Sending crypto request:', requestData);
     
-    const response = await fetch('/api/crypto', {
-      method: 'POST',
-      headers: { 'Content-Type': 'application/json' },
-      body: JSON.stringify(requestData)
-    });
-    
-    if (!response.ok) {
-      const errorText = await response.text();
-      console.error('Server error response:', errorText);
-      throw new Error(`HTTP error! status: ${response.status}`);
+    let result;
+    if (input.length > CRYPTO_JOB_MIN_CHARS || (limit && input.length > limit)) {
+      // Long inputs run as a background job so the request cannot time out
+      result = await runJob({ kind: 'crypto', ...requestData }, (progress) => {
+        resultBox.textContent = progress && progress.percent != null
+          ? `Processing... ${progress.percent}%`
+          : 'Processing...';
+      });
+    } else {
+      const response = await fetch('/api/crypto', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify(requestData)
+      });
+      
+      if (!response.ok) {
+        const errorText = await response.text();
+        console.error('Server error response:', errorText);
+        throw new Error(`HTTP error! status: ${response.status}`);
+      }
+      
+      result = await response.json();
     }
-    
-    const result = await response.json();
     console.log('Crypto response:', result);
     
     if (result.error) {
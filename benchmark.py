@@ -0,0 +1,259 @@
+"""Benchmark suite for the algorithms served by server.py.
+
+    python benchmark.py                                 print a results table
+    python benchmark.py --save baseline.json            record a baseline
+    python benchmark.py --compare baseline.json         flag regressions
+
+Every sorter in build_sorter runs over each input distribution and size;
+the greedy endpoints run through the Flask test client and the ciphers are
+called directly. Each case records its best wall time, its op count (sorters
+only) and its peak traced memory. --compare exits with status 1 when any case
+got slower or heavier than the baseline by more than --threshold, or when a
+sorter's op count changed at all.
+"""
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+import server
+
+SORT_ALGOS = ['bubble', 'selection', 'insertion', 'merge', 'quick', 'heap', 'shell',
+              'counting', 'radix', 'bucket', 'comb', 'tim']
+# The quadratic sorters are skipped above this size
+QUADRATIC_ALGOS = {'bubble', 'selection', 'insertion'}
+QUADRATIC_MAX_N = 2000
+DEFAULT_SIZES = [100, 1000, 10000]
+DEFAULT_REPEAT = 3
+DEFAULT_THRESHOLD = 0.25
+# Timings below this are too noisy to call a regression
+NOISE_FLOOR_MS = 1.0
+SEED = 1234
+
+# =================== INPUT GENERATORS ===================
+def random_input(n, rng):
+    return [rng.randint(0, n) for _ in range(n)]
+
+def sorted_input(n, rng):
+    return list(range(n))
+
+def reversed_input(n, rng):
+    return list(range(n, 0, -1))
+
+def few_unique_input(n, rng):
+    return [rng.randrange(8) for _ in range(n)]
+
+def organ_pipe_input(n, rng):
+    half = n // 2
+    return list(range(half)) + list(range(n - half, 0, -1))
+
+def nearly_sorted_input(n, rng):
+    arr = list(range(n))
+    for _ in range(max(1, n // 100)):
+        i, j = rng.randrange(n), rng.randrange(n)
+        arr[i], arr[j] = arr[j], arr[i]
+    return arr
+
+INPUT_GENERATORS = {
+    'random': random_input,
+    'sorted': sorted_input,
+    'reversed': reversed_input,
+    'few_unique': few_unique_input,
+    'organ_pipe': organ_pipe_input,
+    'nearly_sorted': nearly_sorted_input,
+}
+
+def random_text(n, rng):
+    return ''.join(rng.choice('ABCDEFGHIJKLMNOPQRSTUVWXYZ') for _ in range(n))
+
+# =================== CASES ===================
+# A case is (group, name, input, n, run); run() returns an op count or None.
+def sort_cases(sizes):
+    for algo in SORT_ALGOS:
+        for input_name, generate in INPUT_GENERATORS.items():
+            for n in sizes:
+                if algo in QUADRATIC_ALGOS and n > QUADRATIC_MAX_N:
+                    continue
+                arr = generate(n, random.Random(SEED))
+
+                def run(algo=algo, arr=arr):
+                    stats = server.collect_stats(server.build_sorter(algo, arr[:], {}), algo, len(arr))
+                    return stats['totalOps']
+
+                yield 'sort', algo, input_name, n, run
+
+def greedy_payloads(n, rng):
+    activities = []
+    for _ in range(n):
+        start = rng.randrange(n * 10)
+        activities.append(f"{start},{start + rng.randint(1, 50)}")
+    items = [f"{rng.randint(1, 100)},{rng.randint(1, 500)}" for _ in range(n)]
+    jobs = [f"J{i},{rng.randint(1, n)},{rng.randint(1, 1000)}" for i in range(n)]
+    return {
+        'activity': ('/api/greedy/activity', {'activities': ';'.join(activities)}),
+        'knapsack': ('/api/greedy/knapsack', {'items': ';'.join(items), 'capacity': n * 25}),
+        'egyptian': ('/api/greedy/egyptian', {'numerator': n - 1, 'denominator': n * 7 + 3}),
+        'job-sequencing': ('/api/greedy/job-sequencing', {'jobs': ';'.join(jobs)}),
+        'huffman': ('/api/greedy/huffman', {'pairs': random_text(n, rng)}),
+        'huffman-encode': ('/api/greedy/huffman/encode', {'text': random_text(n, rng), 'verify': True}),
+    }
+
+def greedy_cases(sizes):
+    client = server.app.test_client()
+    for n in sizes:
+        for name, (path, payload) in greedy_payloads(n, random.Random(SEED)).items():
+            def run(path=path, payload=payload):
+                response = client.post(path, json=payload)
+                if response.status_code != 200:
+                    raise RuntimeError(f"{path}: {response.get_json()['error']}")
+
+            yield 'greedy', name, 'random', n, run
+
+CRYPTO_CASES = {
+    'caesar': (server.caesar_cipher_crypto, '3'),
+    'playfair': (server.playfair_cipher_crypto, 'MONARCHY'),
+    'vigenere': (server.vigenere_cipher_crypto, 'LEMON'),
+    'affine': (server.affine_cipher_crypto, '5,8'),
+    'railfence': (server.rail_fence_cipher_crypto, '3'),
+    'columnar': (server.columnar_transposition_crypto, 'ZEBRAS'),
+    'substitution': (server.substitution_cipher_crypto, ''),
+    'scytale': (server.scytale_cipher_crypto, '4'),
+    'hill': (server.hill_cipher_crypto, '3,2,1,4'),
+    'spn': (server.spn_cipher_crypto, 'KEY'),
+    'product': (server.product_cipher_crypto, 'ZEBRAS'),
+}
+
+def crypto_cases(sizes):
+    for n in sizes:
+        text = random_text(n, random.Random(SEED))
+        for name, (cipher, key) in CRYPTO_CASES.items():
+            if name == 'hill':
+                def run(cipher=cipher, key=key, text=text):
+                    cipher(text, key, 2, 'encrypt', [], [])
+            else:
+                def run(cipher=cipher, key=key, text=text):
+                    cipher(text, key, 'encrypt', [], [])
+            yield 'crypto', name, 'random', n, run
+
+        def run_sha(text=text):
+            server.sha256_hash_crypto(text, [], [])
+
+        def run_kasiski(text=text):
+            server.kasiski_examination_crypto(text, '', [], [])
+
+        yield 'crypto', 'sha256', 'random', n, run_sha
+        yield 'crypto', 'kasiski', 'random', n, run_kasiski
+
+# =================== RUNNER ===================
+def measure(run, repeat):
+    """Best-of-repeat wall time, then one extra traced run for peak memory"""
+    best = None
+    ops = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        ops = run()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    tracemalloc.start()
+    try:
+        run()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    result = {'timeMs': round(best * 1000, 3), 'peakKb': round(peak / 1024, 1)}
+    if ops is not None:
+        result['ops'] = ops
+    return result
+
+def run_suite(sizes, groups, repeat, only=None):
+    cases = []
+    if 'sort' in groups:
+        cases.extend(sort_cases(sizes))
+    if 'greedy' in groups:
+        cases.extend(greedy_cases(sizes))
+    if 'crypto' in groups:
+        cases.extend(crypto_cases(sizes))
+
+    results = {}
+    for group, name, input_name, n, run in cases:
+        if only and name not in only:
+            continue
+        key = f"{group}/{name}/{input_name}/{n}"
+        try:
+            results[key] = measure(run, repeat)
+        except Exception as e:
+            results[key] = {'error': str(e)}
+        print(f"{key:<40} {format_result(results[key])}", file=sys.stderr)
+    return results
+
+def format_result(result):
+    if 'error' in result:
+        return f"error: {result['error']}"
+    text = f"{result['timeMs']:>10.3f} ms {result['peakKb']:>10.1f} KB"
+    if 'ops' in result:
+        text += f" {result['ops']:>10} ops"
+    return text
+
+def compare(results, baseline, threshold):
+    """List every case that regressed against the baseline"""
+    regressions = []
+    for key, base in baseline.items():
+        current = results.get(key)
+        if current is None or 'error' in base:
+            continue
+        if 'error' in current:
+            regressions.append(f"{key}: now fails ({current['error']})")
+            continue
+        if 'ops' in base and current.get('ops') != base['ops']:
+            regressions.append(f"{key}: ops {base['ops']} -> {current.get('ops')}")
+        if current['timeMs'] > NOISE_FLOOR_MS and current['timeMs'] > base['timeMs'] * (1 + threshold):
+            regressions.append(f"{key}: time {base['timeMs']}ms -> {current['timeMs']}ms "
+                               f"(+{(current['timeMs'] / base['timeMs'] - 1) * 100:.0f}%)")
+        if current['peakKb'] > base['peakKb'] * (1 + threshold):
+            regressions.append(f"{key}: peak memory {base['peakKb']}KB -> {current['peakKb']}KB")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--groups', nargs='+', default=['sort', 'greedy', 'crypto'],
+                        choices=['sort', 'greedy', 'crypto'])
+    parser.add_argument('--only', nargs='+', help='run only these algorithm names')
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT)
+    parser.add_argument('--save', metavar='FILE', help='write the results as a JSON baseline')
+    parser.add_argument('--compare', metavar='FILE', help='compare against a JSON baseline')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='allowed relative slowdown before a case is flagged (default 0.25)')
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.sizes, args.groups, args.repeat, args.only)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({
+                'python': platform.python_version(),
+                'machine': platform.machine(),
+                'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'results': results
+            }, f, indent=2, sort_keys=True)
+        print(f"Saved {len(results)} results to {args.save}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) against {args.compare}:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"No regressions against {args.compare}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
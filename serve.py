@@ -0,0 +1,253 @@
+"""Production entry point: a pre-fork server for the Flask app in server.py.
+
+    python serve.py --workers 4 --threads 4 --port 8000
+
+The master binds the listening socket and forks the workers; it never imports
+the app itself. Each worker imports server.py after the fork and handles
+requests on a fixed pool of threads, so CPU-bound sorts run in parallel across
+processes. Signals to the master:
+
+    SIGHUP           start a fresh set of workers running the current code,
+                     then let the old ones finish their in-flight requests
+    SIGTERM, SIGINT  drain every worker and exit
+
+index.html, app.js and styles.css are answered from memory (with ETag and
+gzip) by a WSGI middleware in front of Flask. `python server.py` is still the
+development server.
+"""
+import argparse
+import gzip
+import hashlib
+import logging
+import mimetypes
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+from werkzeug.serving import BaseWSGIServer, WSGIRequestHandler
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+STATIC_FILES = ('index.html', 'app.js', 'styles.css')
+DEFAULT_THREADS = 4
+# Seconds a draining worker gets before the master kills it
+GRACEFUL_TIMEOUT = 30
+# Seconds a connection may sit idle mid-request before its thread is freed
+REQUEST_TIMEOUT = 30
+MASTER_TICK = 0.5
+
+# =================== STATIC FILES ===================
+class StaticFiles:
+    """WSGI middleware answering the frontend's files from memory; the rest goes to app"""
+    def __init__(self, app, root, files):
+        self.app = app
+        self.routes = {}
+        for name in files:
+            with open(os.path.join(root, name), 'rb') as f:
+                body = f.read()
+            content_type = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+            if content_type.startswith('text/'):
+                content_type += '; charset=utf-8'
+            compressed = gzip.compress(body, 9)
+            self.routes['/' + name] = {
+                'body': body,
+                'gzip': compressed if len(compressed) < len(body) else None,
+                'etag': '"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"',
+                'type': content_type
+            }
+        if '/index.html' in self.routes:
+            self.routes['/'] = self.routes['/index.html']
+
+    def __call__(self, environ, start_response):
+        entry = self.routes.get(environ.get('PATH_INFO'))
+        method = environ.get('REQUEST_METHOD')
+        if entry is None or method not in ('GET', 'HEAD'):
+            return self.app(environ, start_response)
+
+        # The files are not fingerprinted, so browsers revalidate with the ETag
+        headers = [('ETag', entry['etag']), ('Cache-Control', 'no-cache'), ('Vary', 'Accept-Encoding')]
+        if entry['etag'] in environ.get('HTTP_IF_NONE_MATCH', ''):
+            start_response('304 Not Modified', headers)
+            return [b'']
+
+        body = entry['body']
+        if entry['gzip'] is not None and 'gzip' in environ.get('HTTP_ACCEPT_ENCODING', ''):
+            body = entry['gzip']
+            headers.append(('Content-Encoding', 'gzip'))
+        headers.append(('Content-Type', entry['type']))
+        headers.append(('Content-Length', str(len(body))))
+        start_response('200 OK', headers)
+        return [b''] if method == 'HEAD' else [body]
+
+# =================== WORKERS ===================
+class RequestHandler(WSGIRequestHandler):
+    # One request per connection: an idle keep-alive socket would otherwise hold
+    # one of the worker's few threads
+    protocol_version = 'HTTP/1.0'
+    timeout = REQUEST_TIMEOUT
+
+class PooledWSGIServer(BaseWSGIServer):
+    """Werkzeug server that hands each connection to a fixed-size thread pool"""
+    multithread = True
+
+    def __init__(self, host, port, app, threads, fd):
+        super().__init__(host, port, app, handler=RequestHandler, fd=fd)
+        self.pool = ThreadPoolExecutor(max_workers=threads)
+        # One slot per thread: while every thread is busy the accept loop
+        # waits here, so further connections stay in the listen backlog for
+        # an idle worker instead of queueing inside this one
+        self.slots = threading.BoundedSemaphore(threads)
+
+    def process_request(self, request, client_address):
+        self.slots.acquire()
+        try:
+            self.pool.submit(self.process_request_thread, request, client_address)
+        except Exception:
+            self.slots.release()
+            self.shutdown_request(request)
+            raise
+
+    def process_request_thread(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            self.slots.release()
+
+def run_worker(listener, host, port, threads):
+    # Until the server is up, a stop signal simply ends the worker
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    signal.signal(signal.SIGHUP, signal.SIG_IGN)
+    # Imported here, after the fork, so every new worker runs the current code
+    import server
+
+    httpd = PooledWSGIServer(host, port, StaticFiles(server.app, ROOT, STATIC_FILES), threads,
+                             fd=listener.fileno())
+
+    def drain(signum, frame):
+        # shutdown() waits for serve_forever, so it cannot run on this thread
+        threading.Thread(target=httpd.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGTERM, drain)
+    signal.signal(signal.SIGINT, drain)
+    httpd.serve_forever()
+    httpd.pool.shutdown(wait=True)
+
+# =================== MASTER ===================
+class Arbiter:
+    """Keep the configured number of workers alive and swap them on SIGHUP"""
+    def __init__(self, listener, host, port, workers, threads):
+        self.listener = listener
+        self.host = host
+        self.port = port
+        self.worker_count = workers
+        self.threads = threads
+        self.workers = {}  # pid -> generation
+        self.generation = 0
+        self.reloading = False
+        self.stopping = False
+
+    def spawn(self):
+        pid = os.fork()
+        if pid:
+            self.workers[pid] = self.generation
+            return
+        code = 0
+        try:
+            run_worker(self.listener, self.host, self.port, self.threads)
+        except BaseException:
+            traceback.print_exc()
+            code = 1
+        finally:
+            os._exit(code)
+
+    def reap(self):
+        while self.workers:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                self.workers.clear()
+                return
+            if not pid:
+                return
+            generation = self.workers.pop(pid, None)
+            if generation == self.generation and not self.stopping:
+                print(f'Worker {pid} exited with status {status}; replacing it', file=sys.stderr)
+
+    def signal_workers(self, pids, signum):
+        for pid in pids:
+            try:
+                os.kill(pid, signum)
+            except ProcessLookupError:
+                pass
+
+    def reload(self):
+        self.reloading = False
+        old = list(self.workers)
+        self.generation += 1
+        for _ in range(self.worker_count):
+            self.spawn()
+        # New workers are already accepting, so the old ones can drain at leisure
+        self.signal_workers(old, signal.SIGTERM)
+        print(f'Reloaded: generation {self.generation}, draining {len(old)} old workers', file=sys.stderr)
+
+    def stop(self):
+        self.signal_workers(list(self.workers), signal.SIGTERM)
+        deadline = time.monotonic() + GRACEFUL_TIMEOUT
+        while self.workers and time.monotonic() < deadline:
+            self.reap()
+            time.sleep(0.1)
+        self.signal_workers(list(self.workers), signal.SIGKILL)
+        self.reap()
+
+    def run(self):
+        def request_reload(signum, frame):
+            self.reloading = True
+
+        def request_stop(signum, frame):
+            self.stopping = True
+
+        signal.signal(signal.SIGHUP, request_reload)
+        signal.signal(signal.SIGTERM, request_stop)
+        signal.signal(signal.SIGINT, request_stop)
+
+        print(f'Serving on http://{self.host}:{self.port} with {self.worker_count} workers '
+              f'x {self.threads} threads (master pid {os.getpid()})', file=sys.stderr)
+        while not self.stopping:
+            if self.reloading:
+                self.reload()
+            self.reap()
+            live = sum(1 for generation in self.workers.values() if generation == self.generation)
+            for _ in range(self.worker_count - live):
+                self.spawn()
+            time.sleep(MASTER_TICK)
+        self.stop()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--threads', type=int, default=DEFAULT_THREADS,
+                        help='request threads per worker (default 4)')
+    parser.add_argument('--backlog', type=int, default=128)
+    parser.add_argument('--quiet', action='store_true', help='turn off the per-request access log')
+    args = parser.parse_args(argv)
+
+    if args.quiet:
+        logging.getLogger('werkzeug').setLevel(logging.WARNING)
+
+    family = socket.AF_INET6 if ':' in args.host else socket.AF_INET
+    listener = socket.create_server((args.host, args.port), family=family, backlog=args.backlog)
+    listener.set_inheritable(True)
+    Arbiter(listener, args.host, args.port, args.workers, args.threads).run()
+
+if __name__ == '__main__':
+    main()
@@ -1,9 +1,31 @@
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, request, jsonify, send_from_directory, Response, g
 from flask_cors import CORS
 import heapq
+from bisect import bisect_left, bisect_right
 from fractions import Fraction
 import re
 import os
+import sys
+import json
+import time
+import random
+import base64
+import io
+import cProfile
+import pstats
+import threading
+import hashlib
+import tempfile
+import uuid
+from array import array
+from itertools import islice
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import numpy as np
+except ImportError:  # only the engine='numpy' sort path needs it
+    np = None
 
 app = Flask(__name__)
 CORS(app)
@@ -18,198 +40,1229 @@ def serve_index():
 def serve_static(path):
     return send_from_directory('.', path)
 
+# =================== INSTRUMENTATION ===================
+# Every /api request is timed and sized in after_request and exported at
+# /metrics in the Prometheus text format. Counters are per process, so a
+# pre-forked deployment needs each worker scraped (or summed) separately.
+# Adding ?profile=1 to any JSON endpoint attaches a cProfile summary.
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+SIZE_BUCKETS = (10, 100, 1000, 10000, 100000, 1000000)
+BYTE_BUCKETS = (256, 1024, 16384, 131072, 1048576, 8388608, 67108864)
+PROFILE_TOP_N = 25
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0
+    
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+metrics_lock = threading.Lock()
+request_counts = {}  # (route, algorithm, status) -> requests
+route_histograms = {}  # (route, algorithm) -> {'latency', 'inputSize', 'responseBytes'}
+op_totals = {}  # (route, algorithm) -> ops emitted
+
+def record_ops(route, algorithm, count):
+    with metrics_lock:
+        op_totals[(route, algorithm)] = op_totals.get((route, algorithm), 0) + count
+
+# The body field that selects an algorithm on each route, and the values it
+# may take there; the lookups run per request since the tables come later
+METRIC_LABELS = {
+    '/api/sort': ('algo', lambda: ALGORITHMS['sort']),
+    '/api/crypto': ('algorithm', lambda: ALGORITHMS['crypto']),
+    '/api/more': ('algo', lambda: ALGORITHMS['more']),
+    '/api/math': ('operation', lambda: MATH_OPERATIONS),
+    '/api/jobs': ('kind', lambda: JOB_KINDS),
+    '/api/greedy/knapsack': ('engine', lambda: KNAPSACK_ENGINES),
+    '/api/greedy/activity': ('mode', lambda: ACTIVITY_MODES),
+}
+# The request field holding each route's input, which inputSize measures;
+# where a route takes one of several, the first one present counts
+METRIC_PAYLOADS = {
+    '/api/sort': ('array',),
+    '/api/sort/gaps': ('array',),
+    '/api/sort/batch': ('arrays',),
+    '/api/jobs': ('array', 'input', 'pairs'),
+    '/api/crypto': ('input',),
+    '/api/more': ('pairs',),
+    '/api/math/chinese-remainder': ('pairs',),
+    '/api/greedy/activity': ('activities',),
+    '/api/greedy/knapsack': ('items',),
+    '/api/greedy/job-sequencing': ('jobs',),
+    '/api/greedy/huffman': ('pairs',),
+    '/api/greedy/huffman/encode': ('data', 'text'),
+    '/api/greedy/huffman/decode': ('encoded',),
+}
+
+def request_algorithm(route, data):
+    """Label a request by the algorithm its body selects, if the route knows that name"""
+    if route not in METRIC_LABELS or not isinstance(data, dict):
+        return ''
+    field, known = METRIC_LABELS[route]
+    label = data.get(field)
+    # Anything else gets no label, so clients cannot mint new series
+    return label if isinstance(label, str) and label in known() else ''
+
+def request_input_size(route, data):
+    """Length of the route's payload field; keys, options and labels do not count"""
+    if not isinstance(data, dict):
+        return 0
+    for field in METRIC_PAYLOADS.get(route, ()):
+        value = data.get(field)
+        if isinstance(value, (list, str)):
+            return len(value)
+    return 0
+
+@app.before_request
+def start_request_metrics():
+    if not request.path.startswith('/api/'):
+        return
+    g.metrics_start = time.perf_counter()
+    g.profiler = None
+    if request.args.get('profile') == '1':
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+            g.profiler = profiler
+        except ValueError:
+            # Another request is already being profiled on this interpreter
+            pass
+
+@app.after_request
+def finish_request_metrics(response):
+    if 'metrics_start' not in g:
+        return response
+    
+    profiler = g.profiler
+    if profiler is not None:
+        profiler.disable()
+        if response.is_json and not response.is_streamed:
+            body = response.get_json()
+            if isinstance(body, dict):
+                summary = io.StringIO()
+                pstats.Stats(profiler, stream=summary).sort_stats('cumulative').print_stats(PROFILE_TOP_N)
+                body['profile'] = summary.getvalue()
+                response.set_data(json.dumps(body))
+    
+    elapsed = time.perf_counter() - g.metrics_start
+    route = request.url_rule.rule if request.url_rule else 'unmatched'
+    data = request.get_json(silent=True)
+    algorithm = request_algorithm(route, data) if response.status_code < 400 else 'invalid'
+    key = (route, algorithm)
+    
+    with metrics_lock:
+        count_key = (route, algorithm, str(response.status_code))
+        request_counts[count_key] = request_counts.get(count_key, 0) + 1
+        histograms = route_histograms.get(key)
+        if histograms is None:
+            histograms = route_histograms[key] = {
+                'latency': Histogram(LATENCY_BUCKETS),
+                'inputSize': Histogram(SIZE_BUCKETS),
+                'responseBytes': Histogram(BYTE_BUCKETS)
+            }
+        histograms['latency'].observe(elapsed)
+        histograms['inputSize'].observe(request_input_size(route, data))
+        # Streamed bodies are still being generated, so their size is unknown here
+        if not response.is_streamed:
+            histograms['responseBytes'].observe(response.content_length or 0)
+    return response
+
+def metric_labels(**labels):
+    escaped = []
+    for name, value in labels.items():
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        escaped.append(f'{name}="{value}"')
+    return '{' + ','.join(escaped) + '}'
+
+def render_histogram(lines, name, help_text, histograms):
+    lines.append(f'# HELP {name} {help_text}')
+    lines.append(f'# TYPE {name} histogram')
+    for (route, algorithm), histogram in histograms:
+        cumulative = 0
+        for bound, count in zip(list(histogram.buckets) + ['+Inf'], histogram.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{metric_labels(route=route, algorithm=algorithm, le=bound)} {cumulative}')
+        labels = metric_labels(route=route, algorithm=algorithm)
+        lines.append(f'{name}_sum{labels} {histogram.sum}')
+        lines.append(f'{name}_count{labels} {cumulative}')
+
+@app.route('/metrics')
+def metrics():
+    with metrics_lock:
+        counts = sorted(request_counts.items())
+        histograms = sorted(route_histograms.items())
+        ops = sorted(op_totals.items())
+    
+    lines = ['# HELP algorithms_requests_total API requests by route, algorithm and status',
+             '# TYPE algorithms_requests_total counter']
+    for (route, algorithm, status), count in counts:
+        lines.append(f'algorithms_requests_total{metric_labels(route=route, algorithm=algorithm, status=status)} {count}')
+    
+    render_histogram(lines, 'algorithms_request_duration_seconds', 'Time spent handling the request',
+                     [(key, h['latency']) for key, h in histograms])
+    render_histogram(lines, 'algorithms_request_input_size', 'Elements in the request payload field',
+                     [(key, h['inputSize']) for key, h in histograms])
+    render_histogram(lines, 'algorithms_response_size_bytes', 'Size of the response body',
+                     [(key, h['responseBytes']) for key, h in histograms])
+    
+    lines.append('# HELP algorithms_ops_total Trace ops generated by the sorters')
+    lines.append('# TYPE algorithms_ops_total counter')
+    for (route, algorithm), count in ops:
+        lines.append(f'algorithms_ops_total{metric_labels(route=route, algorithm=algorithm)} {count}')
+    
+    with sort_cache.lock:
+        cache_counters = [('hits', sort_cache.hits), ('misses', sort_cache.misses),
+                          ('evictions', sort_cache.evictions)]
+        cache_bytes, cache_entries = sort_cache.size, len(sort_cache.entries)
+    for name, value in cache_counters:
+        lines.append(f'# TYPE algorithms_sort_cache_{name}_total counter')
+        lines.append(f'algorithms_sort_cache_{name}_total {value}')
+    lines.append('# TYPE algorithms_sort_cache_bytes gauge')
+    lines.append(f'algorithms_sort_cache_bytes {cache_bytes}')
+    lines.append('# TYPE algorithms_sort_cache_entries gauge')
+    lines.append(f'algorithms_sort_cache_entries {cache_entries}')
+    
+    return Response('\n'.join(lines) + '\n', mimetype='text/plain; version=0.0.4')
+
+# =================== SORT RESULT CACHE ===================
+# Demo traffic replays the same preset arrays, so finished /api/sort traces are
+# kept as serialized JSON (or NDJSON, for streams) keyed by a hash of the whole
+# request body. A hit costs one hash and one dict lookup. The cache is per process.
+SORT_CACHE_MAX_BYTES = 64 << 20
+# Streams past this size pass through uncached rather than being buffered
+SORT_CACHE_MAX_STREAM_BYTES = 8 << 20
+
+class ResponseCache:
+    """LRU of serialized responses, bounded by total body bytes"""
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+    
+    def get(self, key):
+        with self.lock:
+            body = self.entries.get(key)
+            if body is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return body
+    
+    def put(self, key, body):
+        if len(body) > self.max_bytes:
+            return
+        with self.lock:
+            old = self.entries.pop(key, None)
+            if old is not None:
+                self.size -= len(old)
+            self.entries[key] = body
+            self.size += len(body)
+            while self.size > self.max_bytes:
+                _, evicted = self.entries.popitem(last=False)
+                self.size -= len(evicted)
+                self.evictions += 1
+
+sort_cache = ResponseCache(SORT_CACHE_MAX_BYTES)
+
+def sort_cache_key(data):
+    """Hash the algorithm, input array and every trace option together"""
+    canonical = json.dumps(data, sort_keys=True, separators=(',', ':'))
+    return hashlib.blake2b(canonical.encode(), digest_size=16).hexdigest()
+
+def cache_stream(chunks, key, budget):
+    """Pass NDJSON chunks through, caching the whole stream once it completes"""
+    kept = []
+    size = 0
+    for chunk in chunks:
+        yield chunk
+        if kept is not None:
+            size += len(chunk)
+            if size > SORT_CACHE_MAX_STREAM_BYTES:
+                kept = None
+            else:
+                kept.append(chunk)
+    # Only a stream that reached its done line, and not by deadline, replays the same
+    if kept and kept[-1].startswith('{"done"') and budget.truncated != 'deadline':
+        sort_cache.put(key, ''.join(kept).encode())
+
+# =================== ALGORITHM REGISTRY ===================
+# Each dispatchable algorithm registers a descriptor: the callable, the request
+# fields it accepts, its complexity and a maximum input size. Routes look the
+# descriptor up instead of walking if/elif chains, and /api/algorithms serves
+# the whole table so the frontend can build its menus from it.
+ALGORITHMS = {'sort': {}, 'crypto': {}, 'more': {}}
+
+# Input ceilings shared by several descriptors
+QUADRATIC_MAX_N = 5000
+# Comb and shell sort: about SORT_MAX_TRACE_OPS ops on random input at this size
+GAP_SORT_MAX_N = 50000
+LINEARITHMIC_MAX_N = 200000
+LINEAR_MAX_N = 500000
+CIPHER_MAX_N = 100000
+# Jobs run in the background under JOB_TIME_LIMIT instead of inside one
+# request, so each class gets a ceiling sized to finish well within that
+JOB_QUADRATIC_MAX_N = 40000
+JOB_GAP_SORT_MAX_N = 1000000
+JOB_LINEARITHMIC_MAX_N = 2000000
+JOB_LINEAR_MAX_N = 5000000
+JOB_CIPHER_MAX_N = 1000000
+JOB_KASISKI_MAX_N = 200000
+
+class InputTooLarge(ValueError):
+    pass
+
+# Rough op counts on random input, used to refuse hopeless traces up front
+# and to turn a running job's op count into a percentage. options is the
+# request, for sorters whose cost depends on their parameters.
+def quadratic_cost(n, options=None):
+    return n * (n - 1) // 2
+
+def linearithmic_cost(n, options=None):
+    return n * max(1, n.bit_length())
+
+def linear_cost(n, options=None):
+    return n
+
+def comb_cost(n, options=None):
+    shrink = (options or {}).get('shrink', 1.3)
+    # Past about 1.35 the gaps collapse too fast and comb degrades towards bubble sort
+    if not isinstance(shrink, (int, float)) or not 1 < shrink <= 1.35:
+        return quadratic_cost(n)
+    compares = 0
+    gap = int(n / shrink)
+    while gap > 1:
+        compares += n - gap
+        gap = int(gap / shrink)
+    # About one swap per three compares, then a few bubble passes at gap 1
+    return int(compares * 1.3) + n * max(1, n.bit_length()) // 2
+
+def shell_cost(n, options=None):
+    gaps = shell_gaps(n, (options or {}).get('gapSequence', 'shell'))
+    return max(int(sum(n - gap for gap in gaps) * 1.25), int(4 * n ** 1.25))
+
+def register_algorithm(category, name, label, complexity, stable=None, in_place=None,
+                       max_n=None, job_max_n=None, cost=None, params=None, args=(),
+                       progress=False, stats_budget_ms=None):
+    """Add the decorated function to ALGORITHMS[category] under name.
+
+    params maps a request field to the (keyword, default) it feeds (sorters);
+    args lists the request fields passed positionally (ciphers). progress=True
+    marks functions that take a progress(done, total) keyword for /api/jobs,
+    and job_max_n is their input ceiling there (max_n when omitted).
+    stats_budget_ms is a sorter's stats-mode deadline (the trace one when omitted).
+    """
+    def decorate(fn):
+        ALGORITHMS[category][name] = {
+            'fn': fn,
+            'label': label,
+            'complexity': complexity,
+            'stable': stable,
+            'inPlace': in_place,
+            'maxN': max_n,
+            'jobMaxN': job_max_n if job_max_n is not None else max_n,
+            'cost': cost,
+            'params': params or {},
+            'args': args,
+            'reportsProgress': progress,
+            'statsBudgetMs': stats_budget_ms
+        }
+        return fn
+    return decorate
+
+def lookup_algorithm(category, name):
+    descriptor = ALGORITHMS[category].get(name) if isinstance(name, str) else None
+    if descriptor is None:
+        raise ValueError(f'Unknown algorithm: {name}')
+    return descriptor
+
+def check_input_size(descriptor, name, n, job=False):
+    limit = descriptor['jobMaxN' if job else 'maxN']
+    if limit is not None and n > limit:
+        raise InputTooLarge(f'{name} accepts at most {limit} elements; got {n}')
+
+@app.route('/api/algorithms', methods=['GET'])
+def algorithm_catalog():
+    catalog = {}
+    for category, descriptors in ALGORITHMS.items():
+        catalog[category] = [{
+            'name': name,
+            'label': d['label'],
+            'complexity': d['complexity'],
+            'stable': d['stable'],
+            'inPlace': d['inPlace'],
+            'maxN': d['maxN'],
+            'jobMaxN': d['jobMaxN'],
+            'reportsProgress': d['reportsProgress'] or category == 'sort',
+            'params': list(d['params']) or [field for field in d['args'] if field != 'input']
+        } for name, d in descriptors.items()]
+    catalog['engines'] = ['python', 'numpy'] if np is not None else ['python']
+    catalog['numpyAlgorithms'] = list(NUMPY_ALGORITHMS)
+    return jsonify(catalog)
+
 # =================== SORTING ALGORITHMS ===================
+# Every sorter is a generator of compact op tuples instead of a list of dicts:
+#   (OP_COMPARE, i, j), (OP_SWAP, i, j), (OP_SET, i, value), (OP_GAP, 0, 0, gap)
+#   (OP_PIVOT, i, value), (OP_PARTITION, lt, gt) for the pivot block after a partition
+# Shell and comb sort append the current gap as a fourth element. Recursive
+# sorters return their maximum recursion depth when the generator finishes.
+# sort_array turns the stream into whatever trace format the client asked for.
+OP_COMPARE, OP_SWAP, OP_SET, OP_GAP, OP_PIVOT, OP_PARTITION = range(6)
+OP_NAMES = ['compare', 'swap', 'set', 'gap_change', 'pivot', 'partition']
+
+# Smallest typed-array width first; anything wider falls back to float64
+PACKED_INT_TYPES = [('b', 'int8', 1 << 7), ('h', 'int16', 1 << 15), ('i', 'int32', 1 << 31)]
+
+# Streamed traces start with a small chunk so the first bar moves right away,
+# then double the chunk size to keep per-line overhead low on long traces
+STREAM_FIRST_CHUNK = 64
+STREAM_MAX_CHUNK = 4096
+
+SHELL_GAP_SEQUENCES = ('shell', 'knuth', 'sedgewick', 'tokuda', 'ciura', 'pratt')
+CIURA_GAPS = [1, 4, 10, 23, 57, 132, 301, 701, 1750]
+# Shrink factors tried by the gap comparison when the request names none
+COMB_SHRINKS = [1.2, 1.25, 1.3, 1.35]
+
+# Counting sort keeps a dense count array only up to this many slots per element
+COUNTING_DENSE_FACTOR = 4
+COUNTING_DENSE_MIN = 1024
+BUCKET_SAMPLE_SIZE = 1024
+BUCKET_TARGET_SIZE = 8
+
+RADIX_VARIANTS = ('lsd', 'msd')
+# Largest radix the sorters accept; counting arrays are this long
+RADIX_MAX = 1 << 16
+# MSD radix sort hands buckets this small to insertion sort
+MSD_INSERTION_CUTOFF = 16
+
+QUICK_PIVOTS = ('last', 'median3', 'ninther', 'random')
+QUICK_PARTITIONS = ('lomuto', '3way')
+
+# TimSort enters galloping mode once one run wins this many comparisons in a row
+TIM_MIN_GALLOP = 7
+
+# Every sort runs under a TraceBudget: a wall-clock deadline (requests may only
+# shorten it) and, for traces the client has to hold, an op ceiling. Stats runs
+# hold no trace and are meant for large inputs, so the n log n and linear sorts
+# get a longer stats deadline; the rest keep the trace one.
+SORT_TIME_BUDGET_MS = 10000
+SORT_STATS_TIME_BUDGET_MS = int(os.environ.get('SORT_STATS_TIME_BUDGET_MS', 300000))
+# Conservative stats-mode throughput used to refuse runs that cannot finish in time
+SORT_STATS_OPS_PER_SECOND = 1000000
+SORT_MAX_TRACE_OPS = 2000000
+# Sorters check their deadline once per this many ops
+DEADLINE_CHECK_INTERVAL = 4096
+
 @app.route('/api/sort', methods=['POST'])
 def sort_array():
     try:
         data = request.json
         algo = data.get('algo')
         array = data.get('array', [])
-        
-        ops = []
-        
-        if algo == 'bubble':
-            ops = bubble_sort(array[:])
-        elif algo == 'selection':
-            ops = selection_sort(array[:])
-        elif algo == 'insertion':
-            ops = insertion_sort(array[:])
-        elif algo == 'merge':
-            ops = merge_sort(array[:])
-        elif algo == 'quick':
-            ops = quick_sort(array[:])
-        elif algo == 'heap':
-            ops = heap_sort(array[:])
-        elif algo == 'shell':
-            ops = shell_sort(array[:])
-        elif algo == 'counting':
-            ops = counting_sort(array[:])
-        elif algo == 'radix':
-            ops = radix_sort(array[:])
-        elif algo == 'bucket':
-            ops = bucket_sort(array[:])
-        elif algo == 'comb':
-            ops = comb_sort(array[:])
-        elif algo == 'tim':
-            ops = tim_sort(array[:])
+        trace_format = data.get('format', 'ops')
+        mode = data.get('mode', 'trace')
+        max_frames = data.get('maxFrames')
+        engine = data.get('engine', 'python')
+        
+        if engine not in ('python', 'numpy'):
+            return jsonify({'error': f'Unknown engine: {engine}'}), 400
+        if engine == 'numpy':
+            if np is None:
+                return jsonify({'error': 'The NumPy engine is not available: numpy is not installed'}), 400
+            return jsonify(run_numpy_engine(algo, array, data.get('radix', NUMPY_RADIX)))
+        
+        if trace_format not in ('ops', 'packed'):
+            return jsonify({'error': f'Unknown trace format: {trace_format}'}), 400
+        if mode not in ('trace', 'stream', 'stats'):
+            return jsonify({'error': f'Unknown mode: {mode}'}), 400
+        if max_frames is not None:
+            if not isinstance(max_frames, int) or max_frames < 1:
+                return jsonify({'error': 'maxFrames must be a positive integer'}), 400
+            if mode != 'trace':
+                return jsonify({'error': f'maxFrames cannot be combined with mode: {mode}'}), 400
+        
+        descriptor = lookup_algorithm('sort', algo)
+        # maxN bounds the traces a client has to hold; counters-only runs keep no trace
+        if mode != 'stats':
+            check_input_size(descriptor, algo, len(array))
+        
+        allow_partial = data.get('allowPartial', True)
+        time_ceiling_ms = SORT_TIME_BUDGET_MS
+        if mode == 'stats':
+            time_ceiling_ms = descriptor['statsBudgetMs'] or SORT_TIME_BUDGET_MS
+        time_budget_ms = data.get('timeBudgetMs', time_ceiling_ms)
+        if not isinstance(time_budget_ms, (int, float)) or time_budget_ms <= 0:
+            return jsonify({'error': 'timeBudgetMs must be a positive number'}), 400
+        time_budget_ms = min(time_budget_ms, time_ceiling_ms)
+        # Stats and frames never hold the whole trace, so only the deadline bounds them
+        max_ops = SORT_MAX_TRACE_OPS if mode != 'stats' and max_frames is None else None
+        if 'maxOps' in data:
+            if not isinstance(data['maxOps'], int) or data['maxOps'] < 1:
+                return jsonify({'error': 'maxOps must be a positive integer'}), 400
+            max_ops = min(data['maxOps'], max_ops or data['maxOps'])
+        if not allow_partial and max_ops is not None:
+            expected = descriptor['cost'](len(array), data)
+            if expected > max_ops:
+                return jsonify({
+                    'error': f'{algo} sort on {len(array)} elements needs about {expected} ops, '
+                             f'over the limit of {max_ops}; send a smaller array or allowPartial',
+                    'expectedOps': expected,
+                    'maxOps': max_ops
+                }), 422
+        if not allow_partial and mode == 'stats':
+            expected = descriptor['cost'](len(array), data)
+            expected_ms = expected * 1000 // SORT_STATS_OPS_PER_SECOND
+            if expected_ms > time_budget_ms:
+                return jsonify({
+                    'error': f'{algo} sort on {len(array)} elements needs about {expected} ops, '
+                             f'more than fits in {time_budget_ms} ms; send a smaller array or allowPartial',
+                    'expectedOps': expected,
+                    'timeBudgetMs': time_budget_ms
+                }), 422
+        
+        # Stats carry wall times and random pivots should differ per run, so only
+        # deterministic traces and streams are cached
+        cache_key = None
+        mimetype = 'application/x-ndjson' if mode == 'stream' else 'application/json'
+        if mode != 'stats' and data.get('pivot') != 'random':
+            cache_key = sort_cache_key(data)
+            body = sort_cache.get(cache_key)
+            if body is not None:
+                response = Response(body, mimetype=mimetype)
+                response.headers['X-Cache'] = 'HIT'
+                return response
+        
+        budget = TraceBudget(time_budget_ms / 1000, max_ops)
+        ops = budget.limit(build_sorter(algo, array[:], data))
+        
+        if mode == 'stream':
+            # Headers are already out, so a stream always ends with what it managed
+            on_done = lambda count: record_ops('/api/sort', algo, count)
+            chunks = stream_ops(ops, trace_format, on_done, budget)
+            if cache_key is None:
+                return Response(chunks, mimetype=mimetype)
+            response = Response(cache_stream(chunks, cache_key, budget), mimetype=mimetype)
+            response.headers['X-Cache'] = 'MISS'
+            return response
+        
+        if mode == 'stats':
+            result = {'stats': collect_stats(ops, algo, len(array))}
+            record_ops('/api/sort', algo, result['stats']['totalOps'])
+        elif max_frames is not None:
+            result = budget_frames(ops, array, max_frames)
+            record_ops('/api/sort', algo, result['counts']['totalOps'])
+        elif trace_format == 'packed':
+            result = {'trace': pack_ops(ops)}
+            record_ops('/api/sort', algo, result['trace']['count'])
         else:
-            return jsonify({'error': f'Unknown algorithm: {algo}'}), 400
+            result = {'ops': [op_to_dict(op) for op in ops]}
+            record_ops('/api/sort', algo, len(result['ops']))
+        
+        if budget.truncated:
+            if not allow_partial:
+                return jsonify({'error': budget.explain(), 'truncatedBy': budget.truncated}), 422
+            result['truncated'] = True
+            result['truncatedBy'] = budget.truncated
+            # Where a deadline cuts depends on machine load, so never replay it
+            if budget.truncated == 'deadline':
+                cache_key = None
+        
+        response = jsonify(result)
+        if cache_key is not None:
+            sort_cache.put(cache_key, response.get_data())
+            response.headers['X-Cache'] = 'MISS'
+        return response
+    except InputTooLarge as e:
+        return jsonify({'error': str(e)}), 413
+    except Exception as e:
+        return jsonify({'error': str(e)}), 400
+
+def build_sorter(algo, arr, options):
+    """Create the op generator for algo, configured from the request options"""
+    descriptor = lookup_algorithm('sort', algo)
+    kwargs = {keyword: options.get(field, default)
+              for field, (keyword, default) in descriptor['params'].items()}
+    return descriptor['fn'](arr, **kwargs)
+
+class TraceBudget:
+    """Cut an op stream short once its deadline passes or it reaches max_ops.
+
+    The sorters suspend at every op they yield, so checking here is a
+    cooperative deadline inside their loops. After the stream ends, truncated
+    names the limit that stopped it ('deadline' or 'maxOps'), or is None.
+    progress, if given, is called with the op count before every chunk.
+    """
+    def __init__(self, seconds=None, max_ops=None, progress=None):
+        self.seconds = seconds
+        self.deadline = time.perf_counter() + seconds if seconds else float('inf')
+        self.max_ops = max_ops
+        self.progress = progress
+        self.count = 0
+        self.truncated = None
+    
+    def limit(self, ops):
+        """Pass ops through under the budget, keeping the sorter's return value.
+
+        Ops are forwarded in islice chunks through yield from, so the per-op
+        cost stays in C and the checks run once per chunk.
+        """
+        finished = []
+        
+        def capture():
+            finished.append((yield from ops))
+        
+        source = capture()
+        while not finished:
+            if self.progress is not None:
+                self.progress(self.count)
+            if time.perf_counter() > self.deadline:
+                self.truncated = 'deadline'
+                break
+            step = DEADLINE_CHECK_INTERVAL
+            if self.max_ops is not None:
+                step = min(step, self.max_ops - self.count)
+                # At the ceiling: it only counts as truncated if another op exists
+                if step == 0:
+                    if next(source, None) is None and finished:
+                        break
+                    self.truncated = 'maxOps'
+                    break
+            self.count += step
+            yield from islice(source, step)
         
-        return jsonify({'ops': ops})
+        if finished:
+            return finished[0]
+        source.close()
+        ops.close()
+    
+    def explain(self):
+        if self.truncated == 'deadline':
+            return f'Stopped after {self.count} ops: the {self.seconds:g}s time budget ran out'
+        return f'Stopped after {self.count} ops: traces are limited to {self.max_ops} ops'
+
+def op_to_dict(op):
+    """Expand an op tuple into the dict shape playOps consumes"""
+    code = op[0]
+    if code == OP_GAP:
+        return {'type': 'gap_change', 'gap': op[3]}
+    
+    op_dict = {'type': OP_NAMES[code], 'i': op[1]}
+    if code == OP_SET or code == OP_PIVOT:
+        op_dict['value'] = op[2]
+    else:
+        op_dict['j'] = op[2]
+    if len(op) > 3:
+        op_dict['gap'] = op[3]
+    return op_dict
+
+def pack_ops(ops):
+    """Pack an op stream into parallel typed columns (opcode, i, j/value, gap)"""
+    codes = array('B')
+    first = array('q')
+    second = array('q')
+    gaps = array('q')
+    
+    for op in ops:
+        codes.append(op[0])
+        first.append(op[1])
+        try:
+            second.append(op[2])
+        except (TypeError, OverflowError):
+            # Float or very large values: switch the column to float64
+            second = array('d', second)
+            second.append(op[2])
+        gaps.append(op[3] if len(op) > 3 else 0)
+    
+    columns = {
+        'op': encode_column(codes, 'uint8'),
+        'i': encode_column(*narrow_column(first)),
+        'j': encode_column(*narrow_column(second)),
+    }
+    if any(gaps):
+        columns['gap'] = encode_column(*narrow_column(gaps))
+    
+    return {
+        'format': 'packed',
+        'count': len(codes),
+        'opNames': OP_NAMES,
+        'columns': columns
+    }
+
+@app.route('/api/sort/gaps', methods=['POST'])
+def compare_gap_sequences():
+    """Count the work every shell gap sequence and comb shrink factor does on one input"""
+    try:
+        data = request.json
+        array = data.get('array', [])
+        shrinks = data.get('shrinks', COMB_SHRINKS)
+        
+        shell_results = []
+        for sequence in SHELL_GAP_SEQUENCES:
+            stats = collect_stats(shell_sort(array[:], sequence), 'shell', len(array))
+            stats['sequence'] = sequence
+            stats['gaps'] = shell_gaps(len(array), sequence)
+            shell_results.append(stats)
+        
+        comb_results = []
+        for shrink in shrinks:
+            stats = collect_stats(comb_sort(array[:], shrink), 'comb', len(array))
+            stats['shrink'] = shrink
+            comb_results.append(stats)
+        
+        # Op counts are deterministic, so rank on them rather than wall time
+        shell_results.sort(key=lambda s: s['totalOps'])
+        comb_results.sort(key=lambda s: s['totalOps'])
+        
+        return jsonify({
+            'shell': shell_results,
+            'comb': comb_results,
+            'fastestShell': shell_results[0]['sequence'],
+            'fastestComb': comb_results[0]['shrink'] if comb_results else None
+        })
     except Exception as e:
         return jsonify({'error': str(e)}), 400
 
+def collect_stats(ops, algo, n):
+    """Run a sorter with counters only, discarding every op after counting it"""
+    counts = [0] * len(OP_NAMES)
+    result = {}
+    
+    def drain():
+        result['depth'] = yield from ops
+    
+    start = time.perf_counter()
+    for op in drain():
+        counts[op[0]] += 1
+    elapsed = time.perf_counter() - start
+    
+    stats = {'algorithm': algo, 'n': n}
+    stats.update(summarize_counts(counts))
+    stats['recursionDepth'] = result['depth'] or 0
+    stats['wallTimeMs'] = round(elapsed * 1000, 3)
+    return stats
+
+def summarize_counts(counts):
+    return {
+        'comparisons': counts[OP_COMPARE],
+        'swaps': counts[OP_SWAP],
+        'writes': counts[OP_SET],
+        'gapChanges': counts[OP_GAP],
+        'partitions': counts[OP_PARTITION],
+        'totalOps': sum(counts)
+    }
+
+def budget_frames(ops, arr, max_frames):
+    """Coalesce an op stream into at most max_frames delta frames.
+
+    Each frame carries the final value of every index written since the
+    previous frame. When the budget overflows, neighbouring frames are merged
+    pairwise and the stride doubles, so the trace length never has to be
+    known up front. Op counts stay exact.
+    """
+    shadow = list(arr)
+    counts = [0] * len(OP_NAMES)
+    frames = []
+    writes = {}
+    frame_ops = 0
+    gap = None
+    stride = 1
+    
+    for op in ops:
+        code = op[0]
+        counts[code] += 1
+        frame_ops += 1
+        if code == OP_SWAP:
+            i, j = op[1], op[2]
+            shadow[i], shadow[j] = shadow[j], shadow[i]
+            writes[i] = shadow[i]
+            writes[j] = shadow[j]
+        elif code == OP_SET:
+            shadow[op[1]] = op[2]
+            writes[op[1]] = op[2]
+        if len(op) > 3:
+            gap = op[3]
+        
+        # Compare-only stretches have nothing to draw, so they extend the next frame
+        if frame_ops >= stride and writes:
+            frames.append((writes, frame_ops, gap))
+            writes = {}
+            frame_ops = 0
+            if len(frames) > max_frames:
+                frames = merge_frame_pairs(frames)
+                stride *= 2
+    
+    if writes:
+        frames.append((writes, frame_ops, gap))
+    elif frames:
+        last_writes, last_ops, last_gap = frames[-1]
+        frames[-1] = (last_writes, last_ops + frame_ops, last_gap)
+    while len(frames) > max_frames:
+        frames = merge_frame_pairs(frames)
+    
+    frame_list = []
+    for frame_writes, frame_op_count, frame_gap in frames:
+        indices = sorted(frame_writes)
+        frame = {
+            'type': 'frame',
+            'i': indices,
+            'values': [frame_writes[i] for i in indices],
+            'ops': frame_op_count
+        }
+        if frame_gap is not None:
+            frame['gap'] = frame_gap
+        frame_list.append(frame)
+    
+    return {
+        'ops': frame_list,
+        'frameCount': len(frame_list),
+        'counts': summarize_counts(counts)
+    }
+
+def merge_frame_pairs(frames):
+    merged = []
+    for k in range(0, len(frames) - 1, 2):
+        first_writes, first_ops, _ = frames[k]
+        second_writes, second_ops, second_gap = frames[k + 1]
+        first_writes.update(second_writes)
+        merged.append((first_writes, first_ops + second_ops, second_gap))
+    if len(frames) % 2:
+        merged.append(frames[-1])
+    return merged
+
+def stream_ops(ops, trace_format, on_done=None, budget=None):
+    """Yield the trace as NDJSON chunks while the sorter is still running"""
+    chunk = []
+    chunk_size = STREAM_FIRST_CHUNK
+    count = 0
+    try:
+        for op in ops:
+            chunk.append(op)
+            if len(chunk) >= chunk_size:
+                count += len(chunk)
+                yield encode_chunk(chunk, trace_format)
+                chunk = []
+                chunk_size = min(chunk_size * 2, STREAM_MAX_CHUNK)
+        
+        if chunk:
+            count += len(chunk)
+            yield encode_chunk(chunk, trace_format)
+        if on_done:
+            on_done(count)
+        done = {'done': True, 'count': count}
+        if budget is not None and budget.truncated:
+            done['truncated'] = True
+            done['truncatedBy'] = budget.truncated
+        yield json.dumps(done) + '\n'
+    except Exception as e:
+        # Headers are already sent, so report failures in-band
+        yield json.dumps({'error': str(e)}) + '\n'
+
+def encode_chunk(chunk, trace_format):
+    if trace_format == 'packed':
+        payload = {'trace': pack_ops(chunk)}
+    else:
+        payload = {'ops': [op_to_dict(op) for op in chunk]}
+    return json.dumps(payload, separators=(',', ':')) + '\n'
+
+def narrow_column(values):
+    """Pick the smallest typed-array width that holds every value in the column"""
+    if values.typecode == 'd':
+        return values, 'float64'
+    
+    low, high = (min(values), max(values)) if values else (0, 0)
+    for typecode, dtype, bound in PACKED_INT_TYPES:
+        if -bound <= low and high < bound:
+            return array(typecode, values), dtype
+    return array('d', values), 'float64'
+
+def encode_column(values, dtype):
+    # JS typed arrays read the platform byte order, which is little-endian in practice
+    if sys.byteorder != 'little':
+        values.byteswap()
+    return {'dtype': dtype, 'data': base64.b64encode(values.tobytes()).decode('ascii')}
+
+@register_algorithm('sort', 'bubble', 'Bubble', 'O(n^2)', stable=True, in_place=True,
+                    max_n=QUADRATIC_MAX_N, job_max_n=JOB_QUADRATIC_MAX_N, cost=quadratic_cost)
 def bubble_sort(arr):
-    ops = []
     n = len(arr)
     for i in range(n):
         for j in range(0, n-i-1):
-            ops.append({'type': 'compare', 'i': j, 'j': j+1})
+            yield OP_COMPARE, j, j+1
             if arr[j] > arr[j+1]:
                 arr[j], arr[j+1] = arr[j+1], arr[j]
-                ops.append({'type': 'swap', 'i': j, 'j': j+1})
-    return ops
+                yield OP_SWAP, j, j+1
 
+@register_algorithm('sort', 'selection', 'Selection', 'O(n^2)', stable=False, in_place=True,
+                    max_n=QUADRATIC_MAX_N, job_max_n=JOB_QUADRATIC_MAX_N, cost=quadratic_cost)
 def selection_sort(arr):
-    ops = []
     n = len(arr)
     for i in range(n):
         min_idx = i
         for j in range(i+1, n):
-            ops.append({'type': 'compare', 'i': min_idx, 'j': j})
+            yield OP_COMPARE, min_idx, j
             if arr[j] < arr[min_idx]:
                 min_idx = j
         if min_idx != i:
             arr[i], arr[min_idx] = arr[min_idx], arr[i]
-            ops.append({'type': 'swap', 'i': i, 'j': min_idx})
-    return ops
+            yield OP_SWAP, i, min_idx
 
+@register_algorithm('sort', 'insertion', 'Insertion', 'O(n^2)', stable=True, in_place=True,
+                    max_n=QUADRATIC_MAX_N, job_max_n=JOB_QUADRATIC_MAX_N, cost=quadratic_cost)
 def insertion_sort(arr):
-    ops = []
     for i in range(1, len(arr)):
         key = arr[i]
         j = i-1
         while j >= 0 and key < arr[j]:
-            ops.append({'type': 'compare', 'i': j, 'j': j+1})
+            yield OP_COMPARE, j, j+1
             arr[j+1] = arr[j]
-            ops.append({'type': 'set', 'i': j+1, 'value': arr[j]})
+            yield OP_SET, j+1, arr[j]
             j -= 1
         arr[j+1] = key
-        ops.append({'type': 'set', 'i': j+1, 'value': key})
-    return ops
-
-def merge_sort(arr):
-    ops = []
-    
-    def merge(left, right):
-        merged = []
-        i = j = 0
-        while i < len(left) and j < len(right):
-            if left[i] <= right[j]:
-                merged.append(left[i])
+        yield OP_SET, j+1, key
+
+@register_algorithm('sort', 'merge', 'Merge', 'O(n log n)', stable=True, in_place=False,
+                    max_n=LINEARITHMIC_MAX_N, job_max_n=JOB_LINEARITHMIC_MAX_N, cost=linearithmic_cost,
+                    stats_budget_ms=SORT_STATS_TIME_BUDGET_MS,
+                    params={'natural': ('natural', False)})
+def merge_sort(arr, natural=False):
+    """Bottom-up merge sort that ping-pongs between arr and one auxiliary buffer.
+
+    With natural=True the first pass merges the ascending runs already present
+    in the input instead of single elements.
+    """
+    n = len(arr)
+    if n < 2:
+        return
+    
+    def merge(src, dst, lo, mid, hi):
+        i, j = lo, mid
+        for k in range(lo, hi):
+            if i < mid and (j >= hi or src[i] <= src[j]):
+                dst[k] = src[i]
                 i += 1
             else:
-                merged.append(right[j])
+                dst[k] = src[j]
                 j += 1
-        merged.extend(left[i:])
-        merged.extend(right[j:])
-        return merged
+            yield OP_SET, k, dst[k]
     
-    def recursive_merge_sort(sub_arr, start_idx):
-        if len(sub_arr) <= 1:
-            return sub_arr, []
-        
-        mid = len(sub_arr) // 2
-        left, left_ops = recursive_merge_sort(sub_arr[:mid], start_idx)
-        right, right_ops = recursive_merge_sort(sub_arr[mid:], start_idx + mid)
-        
-        merged = merge(left, right)
-        
-        # Record the merge operation
-        for i, val in enumerate(merged):
-            ops.append({'type': 'set', 'i': start_idx + i, 'value': val})
-        
-        return merged, ops
+    src, dst = arr, [None] * n
     
-    sorted_arr, _ = recursive_merge_sort(arr, 0)
-    return ops
+    if natural:
+        bounds = [0]
+        for k in range(1, n):
+            yield OP_COMPARE, k - 1, k
+            if arr[k] < arr[k - 1]:
+                bounds.append(k)
+        bounds.append(n)
+        
+        while len(bounds) > 2:
+            merged_bounds = [0]
+            for r in range(0, len(bounds) - 1, 2):
+                lo, mid = bounds[r], bounds[r + 1]
+                if r + 2 < len(bounds):
+                    hi = bounds[r + 2]
+                    yield from merge(src, dst, lo, mid, hi)
+                else:
+                    # Odd run out: carry it over unchanged
+                    hi = mid
+                    dst[lo:hi] = src[lo:hi]
+                merged_bounds.append(hi)
+            bounds = merged_bounds
+            src, dst = dst, src
+    else:
+        width = 1
+        while width < n:
+            for lo in range(0, n, 2 * width):
+                mid = min(lo + width, n)
+                hi = min(lo + 2 * width, n)
+                if mid < hi:
+                    yield from merge(src, dst, lo, mid, hi)
+                else:
+                    dst[lo:hi] = src[lo:hi]
+            src, dst = dst, src
+            width *= 2
+    
+    # After an odd number of passes the sorted data sits in the buffer
+    if src is not arr:
+        arr[:] = src
+
+@register_algorithm('sort', 'quick', 'Quick', 'O(n log n)', stable=False, in_place=True,
+                    max_n=LINEARITHMIC_MAX_N, job_max_n=JOB_LINEARITHMIC_MAX_N, cost=linearithmic_cost,
+                    stats_budget_ms=SORT_STATS_TIME_BUDGET_MS,
+                    params={'pivot': ('pivot', 'median3'), 'partition': ('partition', 'lomuto')})
+def quick_sort(arr, pivot='median3', partition='lomuto'):
+    """Introsort: quicksort driven by an explicit stack with a heap sort fallback.
 
-def quick_sort(arr):
-    ops = []
+    The smaller side of every partition is sorted next and the larger side is
+    deferred, so the stack never holds more than log2(n) ranges. A range that
+    goes deeper than 2*log2(n) partitions is finished with heap sort.
+    """
+    if pivot not in QUICK_PIVOTS:
+        raise ValueError(f'Unknown pivot strategy: {pivot}')
+    if partition not in QUICK_PARTITIONS:
+        raise ValueError(f'Unknown partition scheme: {partition}')
     
-    def partition(low, high):
-        pivot = arr[high]
+    n = len(arr)
+    depth_limit = 2 * n.bit_length()
+    max_depth = 0
+    
+    def median_of_three(a, b, c):
+        yield OP_COMPARE, a, b
+        if arr[a] < arr[b]:
+            yield OP_COMPARE, b, c
+            if arr[b] < arr[c]:
+                return b
+            yield OP_COMPARE, a, c
+            return c if arr[a] < arr[c] else a
+        yield OP_COMPARE, a, c
+        if arr[a] < arr[c]:
+            return a
+        yield OP_COMPARE, b, c
+        return c if arr[b] < arr[c] else b
+    
+    def choose_pivot(low, high):
+        if pivot == 'last' or high - low < 2:
+            return high
+        if pivot == 'random':
+            return random.randint(low, high)
+        
+        mid = (low + high) // 2
+        if pivot == 'ninther' and high - low >= 8:
+            # Tukey's ninther: median of the medians of three evenly spaced triples
+            step = (high - low + 1) // 8
+            m1 = yield from median_of_three(low, low + step, low + 2 * step)
+            m2 = yield from median_of_three(mid - step, mid, mid + step)
+            m3 = yield from median_of_three(high - 2 * step, high - step, high)
+            return (yield from median_of_three(m1, m2, m3))
+        return (yield from median_of_three(low, mid, high))
+    
+    def partition_lomuto(low, high, p):
+        if p != high:
+            arr[p], arr[high] = arr[high], arr[p]
+            yield OP_SWAP, p, high
+        pivot_value = arr[high]
         i = low - 1
         
         for j in range(low, high):
-            ops.append({'type': 'compare', 'i': j, 'j': high})
-            if arr[j] <= pivot:
+            yield OP_COMPARE, j, high
+            if arr[j] <= pivot_value:
                 i += 1
                 arr[i], arr[j] = arr[j], arr[i]
                 if i != j:
-                    ops.append({'type': 'swap', 'i': i, 'j': j})
+                    yield OP_SWAP, i, j
         
         arr[i+1], arr[high] = arr[high], arr[i+1]
-        ops.append({'type': 'swap', 'i': i+1, 'j': high})
-        return i + 1
+        yield OP_SWAP, i+1, high
+        return i + 1, i + 1
     
-    def recursive_quick_sort(low, high):
-        if low < high:
-            pi = partition(low, high)
-            recursive_quick_sort(low, pi-1)
-            recursive_quick_sort(pi+1, high)
+    def partition_three_way(low, high, p):
+        # Dutch national flag: < pivot | == pivot | unknown | > pivot
+        if p != low:
+            arr[p], arr[low] = arr[low], arr[p]
+            yield OP_SWAP, p, low
+        pivot_value = arr[low]
+        lt, i, gt = low, low + 1, high
+        
+        while i <= gt:
+            # arr[lt] always holds a copy of the pivot
+            yield OP_COMPARE, i, lt
+            if arr[i] < pivot_value:
+                arr[lt], arr[i] = arr[i], arr[lt]
+                yield OP_SWAP, lt, i
+                lt += 1
+                i += 1
+            elif arr[i] > pivot_value:
+                arr[i], arr[gt] = arr[gt], arr[i]
+                yield OP_SWAP, i, gt
+                gt -= 1
+            else:
+                i += 1
+        return lt, gt
     
-    recursive_quick_sort(0, len(arr)-1)
-    return ops
+    stack = [(0, n - 1, 0)]
+    while stack:
+        low, high, depth = stack.pop()
+        while low < high:
+            if depth >= depth_limit:
+                yield from heap_sort(arr, low, high + 1)
+                break
+            
+            depth += 1
+            max_depth = max(max_depth, depth)
+            p = yield from choose_pivot(low, high)
+            yield OP_PIVOT, p, arr[p]
+            if partition == '3way':
+                lt, gt = yield from partition_three_way(low, high, p)
+            else:
+                lt, gt = yield from partition_lomuto(low, high, p)
+            yield OP_PARTITION, lt, gt
+            
+            # Defer the larger side and keep partitioning the smaller one
+            if lt - low < high - gt:
+                stack.append((gt + 1, high, depth))
+                high = lt - 1
+            else:
+                stack.append((low, lt - 1, depth))
+                low = gt + 1
+    
+    return max_depth
 
-def heap_sort(arr):
-    ops = []
-    n = len(arr)
+@register_algorithm('sort', 'heap', 'Heap', 'O(n log n)', stable=False, in_place=True,
+                    max_n=LINEARITHMIC_MAX_N, job_max_n=JOB_LINEARITHMIC_MAX_N, cost=linearithmic_cost,
+                    stats_budget_ms=SORT_STATS_TIME_BUDGET_MS,
+                    params={'arity': ('arity', 2)})
+def heap_sort(arr, lo=0, hi=None, arity=2):
+    """Heap sort arr[lo:hi] in place on a max-heap with `arity` children per node.
+
+    quick_sort uses the range form as its introsort fallback. Extraction uses
+    Floyd's bounce: the hole left at the root is walked down to a leaf along
+    the larger children (one comparison round per level instead of two), and
+    the displaced value is then sifted back up, which rarely takes long.
+    """
+    if not isinstance(arity, int) or arity < 2:
+        raise ValueError(f'Heap arity must be an integer >= 2, got {arity}')
+    if hi is None:
+        hi = len(arr)
+    n = hi - lo
     
-    def heapify(n, i):
-        largest = i
-        left = 2 * i + 1
-        right = 2 * i + 2
-        
-        if left < n:
-            ops.append({'type': 'compare', 'i': left, 'j': largest})
-            if arr[left] > arr[largest]:
-                largest = left
-        
-        if right < n:
-            ops.append({'type': 'compare', 'i': right, 'j': largest})
-            if arr[right] > arr[largest]:
-                largest = right
-        
-        if largest != i:
-            arr[i], arr[largest] = arr[largest], arr[i]
-            ops.append({'type': 'swap', 'i': i, 'j': largest})
-            heapify(n, largest)
+    def largest_child(first, size):
+        best = first
+        for c in range(first + 1, min(first + arity, size)):
+            yield OP_COMPARE, lo + c, lo + best
+            if arr[lo + c] > arr[lo + best]:
+                best = c
+        return best
+    
+    def sift_down(i, size):
+        # Used while building the heap: stop as soon as the parent wins
+        while True:
+            first = arity * i + 1
+            if first >= size:
+                return
+            c = yield from largest_child(first, size)
+            yield OP_COMPARE, lo + c, lo + i
+            if not arr[lo + c] > arr[lo + i]:
+                return
+            arr[lo + i], arr[lo + c] = arr[lo + c], arr[lo + i]
+            yield OP_SWAP, lo + i, lo + c
+            i = c
+    
+    def sift_bounce(size):
+        value = arr[lo]
+        i = 0
+        while True:
+            first = arity * i + 1
+            if first >= size:
+                break
+            c = yield from largest_child(first, size)
+            arr[lo + i] = arr[lo + c]
+            yield OP_SET, lo + i, arr[lo + i]
+            i = c
+        
+        while i > 0:
+            parent = (i - 1) // arity
+            yield OP_COMPARE, lo + parent, lo + i
+            if not arr[lo + parent] < value:
+                break
+            arr[lo + i] = arr[lo + parent]
+            yield OP_SET, lo + i, arr[lo + i]
+            i = parent
+        arr[lo + i] = value
+        yield OP_SET, lo + i, value
     
     # Build max heap
-    for i in range(n//2 - 1, -1, -1):
-        heapify(n, i)
+    for i in range((n - 2) // arity, -1, -1):
+        yield from sift_down(i, n)
     
     # Extract elements
-    for i in range(n-1, 0, -1):
-        arr[i], arr[0] = arr[0], arr[i]
-        ops.append({'type': 'swap', 'i': i, 'j': 0})
-        heapify(i, 0)
-    
-    return ops
+    for end in range(n - 1, 0, -1):
+        arr[lo + end], arr[lo] = arr[lo], arr[lo + end]
+        yield OP_SWAP, lo + end, lo
+        yield from sift_bounce(end)
 
 
-def shell_sort(arr):
-    ops = []
+def shell_gaps(n, sequence='shell'):
+    """Descending gap sequence for shell_sort; every gap is below n and the last is 1"""
+    if sequence not in SHELL_GAP_SEQUENCES:
+        raise ValueError(f'Unknown gap sequence: {sequence}')
+    if n < 2:
+        return []
+    
+    if sequence == 'shell':
+        # Shell's original n/2, n/4, ..., 1
+        gaps = []
+        gap = n // 2
+        while gap > 0:
+            gaps.append(gap)
+            gap //= 2
+        return gaps
+    
+    if sequence == 'knuth':
+        # (3^k - 1) / 2, capped at n/3 as Knuth recommends
+        gaps = [1]
+        while gaps[-1] * 3 + 1 <= max(1, n // 3):
+            gaps.append(gaps[-1] * 3 + 1)
+    elif sequence == 'sedgewick':
+        # Sedgewick 1986: 1, 4^k + 3*2^(k-1) + 1
+        gaps = [1]
+        k = 1
+        while 4 ** k + 3 * 2 ** (k - 1) + 1 < n:
+            gaps.append(4 ** k + 3 * 2 ** (k - 1) + 1)
+            k += 1
+    elif sequence == 'tokuda':
+        # Tokuda 1992: ceil((9^k - 4^k) / (5 * 4^(k-1)))
+        gaps = []
+        k = 1
+        while True:
+            gap = -(-(9 ** k - 4 ** k) // (5 * 4 ** (k - 1)))
+            if gap >= n:
+                break
+            gaps.append(gap)
+            k += 1
+    elif sequence == 'ciura':
+        # Ciura's empirical gaps, extended geometrically by 2.25
+        gaps = [gap for gap in CIURA_GAPS if gap < n]
+        if len(gaps) == len(CIURA_GAPS):
+            gap = int(gaps[-1] * 2.25)
+            while gap < n:
+                gaps.append(gap)
+                gap = int(gap * 2.25)
+    else:
+        # Pratt: every 3-smooth number 2^p * 3^q below n
+        gaps = []
+        power3 = 1
+        while power3 < n:
+            gap = power3
+            while gap < n:
+                gaps.append(gap)
+                gap *= 2
+            power3 *= 3
+        gaps.sort()
+    
+    return gaps[::-1]
+
+@register_algorithm('sort', 'shell', 'Shell', 'O(n^1.5)', stable=False, in_place=True,
+                    max_n=GAP_SORT_MAX_N, job_max_n=JOB_GAP_SORT_MAX_N, cost=shell_cost,
+                    params={'gapSequence': ('sequence', 'shell')})
+def shell_sort(arr, sequence='shell'):
     n = len(arr)
-    gap = n // 2
+    gaps = shell_gaps(n, sequence)
     
     # Send initial gap information
-    ops.append({'type': 'gap_change', 'gap': gap})
+    if gaps:
+        yield OP_GAP, 0, 0, gaps[0]
     
-    while gap > 0:
+    for k, gap in enumerate(gaps):
         # Send gap change operation for EACH gap
-        ops.append({'type': 'gap_change', 'gap': gap})
+        yield OP_GAP, 0, 0, gap
         
         for i in range(gap, n):
             temp = arr[i]
@@ -218,99 +1271,214 @@ def shell_sort(arr):
             # Insertion sort within the gap
             while j >= gap and arr[j - gap] > temp:
                 # Compare operation
-                ops.append({'type': 'compare', 'i': j - gap, 'j': j, 'gap': gap})
+                yield OP_COMPARE, j - gap, j, gap
                 
                 # Move larger element forward
                 arr[j] = arr[j - gap]
-                ops.append({'type': 'set', 'i': j, 'value': arr[j - gap], 'gap': gap})
+                yield OP_SET, j, arr[j - gap], gap
                 j -= gap
             
             # Place temp in correct position
             if j != i:  # Only set if position changed
                 arr[j] = temp
-                ops.append({'type': 'set', 'i': j, 'value': temp, 'gap': gap})
+                yield OP_SET, j, temp, gap
             elif j >= gap:
                 # Still need to show comparison even if no swap
-                ops.append({'type': 'compare', 'i': j - gap, 'j': j, 'gap': gap})
+                yield OP_COMPARE, j - gap, j, gap
         
-        gap //= 2
         # Send gap change for next gap (if any)
-        if gap > 0:
-            ops.append({'type': 'gap_change', 'gap': gap})
-    
-    return ops
+        if k + 1 < len(gaps):
+            yield OP_GAP, 0, 0, gaps[k + 1]
 
+@register_algorithm('sort', 'counting', 'Counting', 'O(n + k)', stable=True, in_place=False,
+                    max_n=LINEAR_MAX_N, job_max_n=JOB_LINEAR_MAX_N, cost=linear_cost,
+                    stats_budget_ms=SORT_STATS_TIME_BUDGET_MS)
 def counting_sort(arr):
-    ops = []
+    """Counting sort with a range guard.
+
+    A dense count array is only used while the value range stays within a
+    small multiple of n. Wider ranges (one outlier like 10**9) and non-integer
+    values switch to sparse dict counts over the distinct values instead.
+    """
     if not arr:
-        return ops
+        return
     
     max_val = max(arr)
     min_val = min(arr)
-    
-    count = [0] * (max_val - min_val + 1)
-    
-    for num in arr:
-        count[num - min_val] += 1
+    span = max_val - min_val + 1
+    dense = all(isinstance(num, int) for num in arr) and \
+        span <= max(COUNTING_DENSE_MIN, COUNTING_DENSE_FACTOR * len(arr))
     
     output = []
-    for i, cnt in enumerate(count):
-        for _ in range(cnt):
-            output.append(i + min_val)
+    if dense:
+        count = [0] * span
+        
+        for num in arr:
+            count[num - min_val] += 1
+        
+        for i, cnt in enumerate(count):
+            for _ in range(cnt):
+                output.append(i + min_val)
+    else:
+        count = {}
+        for num in arr:
+            count[num] = count.get(num, 0) + 1
+        
+        for num in sorted(count):
+            output.extend([num] * count[num])
     
     for i, val in enumerate(output):
-        ops.append({'type': 'set', 'i': i, 'value': val})
-    
-    return ops
+        yield OP_SET, i, val
 
-def radix_sort(arr):
-    ops = []
+@register_algorithm('sort', 'radix', 'Radix', 'O(d(n + b))', stable=True, in_place=False,
+                    max_n=LINEAR_MAX_N, job_max_n=JOB_LINEAR_MAX_N, cost=linear_cost,
+                    stats_budget_ms=SORT_STATS_TIME_BUDGET_MS,
+                    params={'radix': ('radix', 10), 'radixVariant': ('variant', 'lsd')})
+def radix_sort(arr, radix=10, variant='lsd'):
+    """Radix sort on integer keys in any base from 2 to RADIX_MAX.
+
+    Keys are biased by the minimum value first, so negative numbers sort
+    correctly and the number of digit passes depends on the value range
+    rather than the magnitude. Power-of-two radixes (256, 2048, 65536)
+    extract digits with shifts and masks. The 'msd' variant distributes
+    from the most significant digit down and finishes small buckets with
+    insertion sort.
+    """
+    if not isinstance(radix, int) or not 2 <= radix <= RADIX_MAX:
+        raise ValueError(f'Radix must be an integer from 2 to {RADIX_MAX}, got {radix}')
+    if variant not in RADIX_VARIANTS:
+        raise ValueError(f'Unknown radix sort variant: {variant}')
     if not arr:
-        return ops
+        return
+    if any(not isinstance(x, int) for x in arr):
+        raise ValueError('Radix sort needs integer keys')
     
-    max_val = max(arr)
-    exp = 1
+    n = len(arr)
+    min_val = min(arr)
+    max_key = max(arr) - min_val
+    passes = 0
+    while radix ** passes <= max_key:
+        passes += 1
     
-    while max_val // exp > 0:
-        output = [0] * len(arr)
-        count = [0] * 10
-        
-        for num in arr:
-            count[(num // exp) % 10] += 1
-        
-        for i in range(1, 10):
-            count[i] += count[i-1]
-        
-        i = len(arr) - 1
-        while i >= 0:
-            digit = (arr[i] // exp) % 10
-            output[count[digit] - 1] = arr[i]
-            count[digit] -= 1
-            i -= 1
-        
-        for i in range(len(arr)):
-            if arr[i] != output[i]:
-                arr[i] = output[i]
-                ops.append({'type': 'set', 'i': i, 'value': output[i]})
-        
-        exp *= 10
+    # Keys that fit in 64 bits live in flat typed arrays instead of int lists
+    if max_key < 1 << 63:
+        keys = array('q', [x - min_val for x in arr])
+        buf = array('q', [0]) * n
+    else:
+        keys = [x - min_val for x in arr]
+        buf = [0] * n
+    
+    bits = radix.bit_length() - 1 if radix & (radix - 1) == 0 else 0
+    
+    def digits_of(values, place):
+        if bits:
+            shift, mask = place * bits, radix - 1
+            return [(k >> shift) & mask for k in values]
+        exp = radix ** place
+        return [(k // exp) % radix for k in values]
+    
+    def bucket_starts(count, base):
+        starts = [0] * radix
+        total = base
+        for d in range(radix):
+            starts[d] = total
+            total += count[d]
+        return starts
+    
+    if variant == 'lsd':
+        for place in range(passes):
+            digits = digits_of(keys, place)
+            count = [0] * radix
+            for d in digits:
+                count[d] += 1
+            if max(count) == n:
+                # Every key shares this digit, so the pass would not move anything
+                continue
+            
+            pos = bucket_starts(count, 0)
+            for k, d in zip(keys, digits):
+                buf[pos[d]] = k
+                pos[d] += 1
+            keys, buf = buf, keys
+            
+            for i in range(n):
+                if keys[i] != buf[i]:
+                    yield OP_SET, i, keys[i] + min_val
+    else:
+        def insertion(lo, hi):
+            for i in range(lo + 1, hi):
+                key = keys[i]
+                j = i - 1
+                while j >= lo and key < keys[j]:
+                    yield OP_COMPARE, j, j + 1
+                    keys[j + 1] = keys[j]
+                    yield OP_SET, j + 1, keys[j] + min_val
+                    j -= 1
+                if j + 1 != i:
+                    keys[j + 1] = key
+                    yield OP_SET, j + 1, key + min_val
+        
+        stack = [(0, n, passes - 1)] if passes else []
+        while stack:
+            lo, hi, place = stack.pop()
+            if hi - lo <= MSD_INSERTION_CUTOFF:
+                yield from insertion(lo, hi)
+                continue
+            
+            # Buckets are usually far smaller than the radix, so only the
+            # digits that occur are counted and walked
+            digits = digits_of(keys[lo:hi], place)
+            count = {}
+            for d in digits:
+                count[d] = count.get(d, 0) + 1
+            present = sorted(count)
+            starts = {}
+            total = lo
+            for d in present:
+                starts[d] = total
+                total += count[d]
+            
+            pos = dict(starts)
+            for i, d in zip(range(lo, hi), digits):
+                buf[pos[d]] = keys[i]
+                pos[d] += 1
+            for i in range(lo, hi):
+                if keys[i] != buf[i]:
+                    keys[i] = buf[i]
+                    yield OP_SET, i, keys[i] + min_val
+            
+            if place > 0:
+                for d in present:
+                    if count[d] > 1:
+                        stack.append((starts[d], starts[d] + count[d], place - 1))
     
-    return ops
+    arr[:] = [k + min_val for k in keys]
 
+@register_algorithm('sort', 'bucket', 'Bucket', 'O(n + k)', stable=True, in_place=False,
+                    max_n=LINEAR_MAX_N, job_max_n=JOB_LINEAR_MAX_N, cost=linear_cost,
+                    stats_budget_ms=SORT_STATS_TIME_BUDGET_MS)
 def bucket_sort(arr):
-    ops = []
+    """Bucket sort with sample-based, quantile-bounded buckets.
+
+    Bucket boundaries are quantiles of an evenly strided sample, so skewed
+    data still spreads across buckets instead of piling into one. The
+    bucket count adapts to n (about BUCKET_TARGET_SIZE values per bucket)
+    and shrinks when the sample has few distinct values.
+    """
     if not arr:
-        return ops
+        return
     
-    max_val = max(arr)
-    min_val = min(arr)
-    bucket_count = len(arr)
+    n = len(arr)
+    step = max(1, n // BUCKET_SAMPLE_SIZE)
+    sample = sorted(arr[::step])
+    bucket_count = max(1, min(n // BUCKET_TARGET_SIZE, len(sample)))
     
-    buckets = [[] for _ in range(bucket_count)]
+    # Duplicate quantiles collapse, so heavy repeats share one bucket
+    boundaries = sorted({sample[k * len(sample) // bucket_count] for k in range(1, bucket_count)})
+    buckets = [[] for _ in range(len(boundaries) + 1)]
     
     for num in arr:
-        index = int((num - min_val) / (max_val - min_val + 1) * bucket_count)
-        buckets[index].append(num)
+        buckets[bisect_right(boundaries, num)].append(num)
     
     for bucket in buckets:
         bucket.sort()
@@ -320,15 +1488,16 @@ def bucket_sort(arr):
         output.extend(bucket)
     
     for i, val in enumerate(output):
-        ops.append({'type': 'set', 'i': i, 'value': val})
-    
-    return ops
+        yield OP_SET, i, val
 
-def comb_sort(arr):
-    ops = []
+@register_algorithm('sort', 'comb', 'Comb', 'O(n^2 / 2^p)', stable=False, in_place=True,
+                    max_n=GAP_SORT_MAX_N, job_max_n=JOB_GAP_SORT_MAX_N, cost=comb_cost,
+                    params={'shrink': ('shrink', 1.3)})
+def comb_sort(arr, shrink=1.3):
+    if not isinstance(shrink, (int, float)) or shrink <= 1:
+        raise ValueError(f'Comb sort shrink factor must be greater than 1, got {shrink}')
     n = len(arr)
     gap = n
-    shrink = 1.3
     sorted = False
     
     while not sorted:
@@ -338,38 +1507,788 @@ def comb_sort(arr):
             sorted = True
         
         for i in range(n - gap):
-            ops.append({'type': 'compare', 'i': i, 'j': i + gap, 'gap': gap})
+            yield OP_COMPARE, i, i + gap, gap
             if arr[i] > arr[i + gap]:
                 arr[i], arr[i + gap] = arr[i + gap], arr[i]
-                ops.append({'type': 'swap', 'i': i, 'j': i + gap, 'gap': gap})
+                yield OP_SWAP, i, i + gap, gap
                 sorted = False
-    
-    return ops
 
+@register_algorithm('sort', 'tim', 'Tim', 'O(n log n)', stable=True, in_place=False,
+                    max_n=LINEARITHMIC_MAX_N, job_max_n=JOB_LINEARITHMIC_MAX_N, cost=linearithmic_cost,
+                    stats_budget_ms=SORT_STATS_TIME_BUDGET_MS)
 def tim_sort(arr):
-    ops = []
-    # Simplified version - just use built-in sort for small arrays
-    # In a real implementation, this would be more complex
-    sorted_arr = sorted(arr)
-    for i, val in enumerate(sorted_arr):
-        if i < len(arr) and arr[i] != val:
-            ops.append({'type': 'set', 'i': i, 'value': val})
-    return ops
+    n = len(arr)
+    runs = []  # stack of (base, length) for pending runs
+    min_gallop = TIM_MIN_GALLOP
+    
+    def compute_minrun(n):
+        # Take the six most significant bits of n, plus one if any remaining bit is set
+        r = 0
+        while n >= 64:
+            r |= n & 1
+            n >>= 1
+        return n + r
+    
+    def count_run(lo):
+        """Length of the natural run starting at lo; descending runs are reversed in place"""
+        hi = lo + 1
+        if hi == n:
+            return 1
+        
+        yield OP_COMPARE, hi, lo
+        if arr[hi] < arr[lo]:
+            # Strictly descending, so reversing keeps equal elements stable
+            hi += 1
+            while hi < n:
+                yield OP_COMPARE, hi, hi - 1
+                if not arr[hi] < arr[hi - 1]:
+                    break
+                hi += 1
+            i, j = lo, hi - 1
+            while i < j:
+                arr[i], arr[j] = arr[j], arr[i]
+                yield OP_SWAP, i, j
+                i += 1
+                j -= 1
+        else:
+            hi += 1
+            while hi < n:
+                yield OP_COMPARE, hi, hi - 1
+                if arr[hi] < arr[hi - 1]:
+                    break
+                hi += 1
+        return hi - lo
+    
+    def binary_insertion_sort(lo, hi, start):
+        """Sort arr[lo:hi] when arr[lo:start] is already sorted"""
+        for i in range(start, hi):
+            pivot = arr[i]
+            left, right = lo, i
+            while left < right:
+                mid = (left + right) // 2
+                yield OP_COMPARE, i, mid
+                if pivot < arr[mid]:
+                    right = mid
+                else:
+                    left = mid + 1
+            
+            for k in range(i, left, -1):
+                arr[k] = arr[k - 1]
+                yield OP_SET, k, arr[k]
+            if left != i:
+                arr[left] = pivot
+                yield OP_SET, left, pivot
+    
+    def gallop_left(key, key_pos, seq, seq_pos, base, length, hint):
+        """Return k such that seq[base+k-1] < key <= seq[base+k].
+
+        seq_pos maps seq indices to array positions for the compare ops,
+        since merges gallop over a temporary copy of one run.
+        """
+        last_ofs, ofs = 0, 1
+        yield OP_COMPARE, key_pos, seq_pos + base + hint
+        if seq[base + hint] < key:
+            max_ofs = length - hint
+            while ofs < max_ofs:
+                yield OP_COMPARE, key_pos, seq_pos + base + hint + ofs
+                if seq[base + hint + ofs] < key:
+                    last_ofs = ofs
+                    ofs = (ofs << 1) + 1
+                else:
+                    break
+            ofs = min(ofs, max_ofs)
+            last_ofs += hint
+            ofs += hint
+        else:
+            max_ofs = hint + 1
+            while ofs < max_ofs:
+                yield OP_COMPARE, key_pos, seq_pos + base + hint - ofs
+                if seq[base + hint - ofs] < key:
+                    break
+                last_ofs = ofs
+                ofs = (ofs << 1) + 1
+            ofs = min(ofs, max_ofs)
+            last_ofs, ofs = hint - ofs, hint - last_ofs
+        
+        # Binary search in (last_ofs, ofs]
+        last_ofs += 1
+        while last_ofs < ofs:
+            mid = last_ofs + ((ofs - last_ofs) >> 1)
+            yield OP_COMPARE, key_pos, seq_pos + base + mid
+            if seq[base + mid] < key:
+                last_ofs = mid + 1
+            else:
+                ofs = mid
+        return ofs
+    
+    def gallop_right(key, key_pos, seq, seq_pos, base, length, hint):
+        """Return k such that seq[base+k-1] <= key < seq[base+k]"""
+        last_ofs, ofs = 0, 1
+        yield OP_COMPARE, key_pos, seq_pos + base + hint
+        if key < seq[base + hint]:
+            max_ofs = hint + 1
+            while ofs < max_ofs:
+                yield OP_COMPARE, key_pos, seq_pos + base + hint - ofs
+                if key < seq[base + hint - ofs]:
+                    last_ofs = ofs
+                    ofs = (ofs << 1) + 1
+                else:
+                    break
+            ofs = min(ofs, max_ofs)
+            last_ofs, ofs = hint - ofs, hint - last_ofs
+        else:
+            max_ofs = length - hint
+            while ofs < max_ofs:
+                yield OP_COMPARE, key_pos, seq_pos + base + hint + ofs
+                if key < seq[base + hint + ofs]:
+                    break
+                last_ofs = ofs
+                ofs = (ofs << 1) + 1
+            ofs = min(ofs, max_ofs)
+            last_ofs += hint
+            ofs += hint
+        
+        last_ofs += 1
+        while last_ofs < ofs:
+            mid = last_ofs + ((ofs - last_ofs) >> 1)
+            yield OP_COMPARE, key_pos, seq_pos + base + mid
+            if key < seq[base + mid]:
+                ofs = mid
+            else:
+                last_ofs = mid + 1
+        return ofs
+    
+    def merge_lo(base1, len1, base2, len2):
+        """Merge two adjacent runs left to right, copying the shorter first run aside"""
+        nonlocal min_gallop
+        tmp = arr[base1:base1 + len1]
+        i, end1 = 0, len1
+        j, end2 = base2, base2 + len2
+        dest = base1
+        
+        while i < end1 and j < end2:
+            count1 = count2 = 0
+            # One pair at a time until a run wins min_gallop times in a row
+            while i < end1 and j < end2 and count1 < min_gallop and count2 < min_gallop:
+                yield OP_COMPARE, j, base1 + i
+                if arr[j] < tmp[i]:
+                    arr[dest] = arr[j]
+                    yield OP_SET, dest, arr[dest]
+                    dest += 1
+                    j += 1
+                    count2 += 1
+                    count1 = 0
+                else:
+                    arr[dest] = tmp[i]
+                    yield OP_SET, dest, tmp[i]
+                    dest += 1
+                    i += 1
+                    count1 += 1
+                    count2 = 0
+            if i == end1 or j == end2:
+                break
+            
+            # Galloping mode: copy whole stretches found by exponential search
+            while True:
+                min_gallop -= min_gallop > 1
+                count1 = yield from gallop_right(arr[j], j, tmp, base1, i, end1 - i, 0)
+                for _ in range(count1):
+                    arr[dest] = tmp[i]
+                    yield OP_SET, dest, tmp[i]
+                    dest += 1
+                    i += 1
+                if i == end1:
+                    break
+                
+                count2 = yield from gallop_left(tmp[i], base1 + i, arr, 0, j, end2 - j, 0)
+                for _ in range(count2):
+                    arr[dest] = arr[j]
+                    yield OP_SET, dest, arr[dest]
+                    dest += 1
+                    j += 1
+                if j == end2:
+                    break
+                
+                if count1 < TIM_MIN_GALLOP and count2 < TIM_MIN_GALLOP:
+                    break
+            # Penalize leaving galloping mode
+            min_gallop += 1
+        
+        # Whatever is left of the second run is already in place
+        while i < end1:
+            arr[dest] = tmp[i]
+            yield OP_SET, dest, tmp[i]
+            dest += 1
+            i += 1
+    
+    def merge_hi(base1, len1, base2, len2):
+        """Merge two adjacent runs right to left, copying the shorter second run aside"""
+        nonlocal min_gallop
+        tmp = arr[base2:base2 + len2]
+        i = base1 + len1 - 1
+        j = len2 - 1
+        dest = base2 + len2 - 1
+        
+        while i >= base1 and j >= 0:
+            count1 = count2 = 0
+            while i >= base1 and j >= 0 and count1 < min_gallop and count2 < min_gallop:
+                yield OP_COMPARE, base2 + j, i
+                if tmp[j] < arr[i]:
+                    arr[dest] = arr[i]
+                    yield OP_SET, dest, arr[dest]
+                    dest -= 1
+                    i -= 1
+                    count1 += 1
+                    count2 = 0
+                else:
+                    arr[dest] = tmp[j]
+                    yield OP_SET, dest, tmp[j]
+                    dest -= 1
+                    j -= 1
+                    count2 += 1
+                    count1 = 0
+            if i < base1 or j < 0:
+                break
+            
+            while True:
+                min_gallop -= min_gallop > 1
+                remaining1 = i - base1 + 1
+                k = yield from gallop_right(tmp[j], base2 + j, arr, 0, base1, remaining1, remaining1 - 1)
+                count1 = remaining1 - k
+                for _ in range(count1):
+                    arr[dest] = arr[i]
+                    yield OP_SET, dest, arr[dest]
+                    dest -= 1
+                    i -= 1
+                if i < base1:
+                    break
+                
+                k = yield from gallop_left(arr[i], i, tmp, base2, 0, j + 1, j)
+                count2 = j + 1 - k
+                for _ in range(count2):
+                    arr[dest] = tmp[j]
+                    yield OP_SET, dest, tmp[j]
+                    dest -= 1
+                    j -= 1
+                if j < 0:
+                    break
+                
+                if count1 < TIM_MIN_GALLOP and count2 < TIM_MIN_GALLOP:
+                    break
+            min_gallop += 1
+        
+        # Whatever is left of the first run is already in place
+        while j >= 0:
+            arr[dest] = tmp[j]
+            yield OP_SET, dest, tmp[j]
+            dest -= 1
+            j -= 1
+    
+    def merge_at(k):
+        base1, len1 = runs[k]
+        base2, len2 = runs[k + 1]
+        runs[k] = (base1, len1 + len2)
+        del runs[k + 1]
+        
+        # Elements of run1 that are <= run2[0] are already in place
+        skip = yield from gallop_right(arr[base2], base2, arr, 0, base1, len1, 0)
+        base1 += skip
+        len1 -= skip
+        if len1 == 0:
+            return
+        # Elements of run2 that are >= run1[-1] are already in place
+        len2 = yield from gallop_left(arr[base1 + len1 - 1], base1 + len1 - 1, arr, 0, base2, len2, len2 - 1)
+        if len2 == 0:
+            return
+        
+        if len1 <= len2:
+            yield from merge_lo(base1, len1, base2, len2)
+        else:
+            yield from merge_hi(base1, len1, base2, len2)
+    
+    def merge_collapse():
+        # Keep run lengths decreasing faster than the Fibonacci numbers:
+        # A > B + C and B > C for the three runs on top of the stack
+        while len(runs) > 1:
+            k = len(runs) - 2
+            if (k > 0 and runs[k - 1][1] <= runs[k][1] + runs[k + 1][1]) or \
+               (k > 1 and runs[k - 2][1] <= runs[k - 1][1] + runs[k][1]):
+                if runs[k - 1][1] < runs[k + 1][1]:
+                    k -= 1
+            elif runs[k][1] > runs[k + 1][1]:
+                break
+            yield from merge_at(k)
+    
+    def merge_force_collapse():
+        while len(runs) > 1:
+            k = len(runs) - 2
+            if k > 0 and runs[k - 1][1] < runs[k + 1][1]:
+                k -= 1
+            yield from merge_at(k)
+    
+    if n < 2:
+        return
+    
+    minrun = compute_minrun(n)
+    lo = 0
+    while lo < n:
+        run_len = yield from count_run(lo)
+        if run_len < minrun:
+            # Extend short natural runs to minrun with binary insertion sort
+            forced = min(minrun, n - lo)
+            yield from binary_insertion_sort(lo, lo + forced, lo + run_len)
+            run_len = forced
+        runs.append((lo, run_len))
+        yield from merge_collapse()
+        lo += run_len
+    
+    yield from merge_force_collapse()
+
+# =================== NUMPY SORTING ENGINE ===================
+# Trace-free batch sorting: same algorithm names as /api/sort, vectorized with
+# NumPy on int64/float64 arrays. Only the sorted result and timing come back.
+NUMPY_SORT_KINDS = {'merge': 'stable', 'tim': 'stable', 'quick': 'quicksort', 'heap': 'heapsort'}
+NUMPY_ALGORITHMS = sorted(NUMPY_SORT_KINDS) + ['bucket', 'counting', 'radix']
+# Wider digits mean fewer stable argsort passes
+NUMPY_RADIX = 1 << 16
+
+def run_numpy_engine(algo, values, radix=NUMPY_RADIX):
+    if algo not in NUMPY_ALGORITHMS:
+        raise ValueError(f'No NumPy engine for algorithm: {algo}')
+    
+    a = np.asarray(values)
+    if a.ndim != 1 or (a.size and a.dtype.kind not in 'iuf'):
+        raise ValueError('The NumPy engine needs a flat array of numbers that fit in int64/float64')
+    
+    start = time.perf_counter()
+    if algo in NUMPY_SORT_KINDS:
+        result = np.sort(a, kind=NUMPY_SORT_KINDS[algo])
+    elif algo == 'counting':
+        result = numpy_counting_sort(a)
+    elif algo == 'radix':
+        result = numpy_radix_sort(a, radix)
+    else:
+        result = numpy_bucket_sort(a)
+    elapsed = time.perf_counter() - start
+    
+    return {
+        'engine': 'numpy',
+        'algorithm': algo,
+        'n': int(a.size),
+        'dtype': str(result.dtype),
+        'wallTimeMs': round(elapsed * 1000, 3),
+        'sorted': result.tolist()
+    }
+
+def numpy_counting_sort(a):
+    if a.size == 0:
+        return a
+    # Same range guard as counting_sort: dense bincount only for narrow ranges
+    if a.dtype.kind in 'iu':
+        low, high = int(a.min()), int(a.max())
+        span = high - low + 1
+        if span <= max(COUNTING_DENSE_MIN, COUNTING_DENSE_FACTOR * a.size):
+            counts = np.bincount(a - low, minlength=span)
+            return np.repeat(np.arange(low, high + 1, dtype=a.dtype), counts)
+    values, counts = np.unique(a, return_counts=True)
+    return np.repeat(values, counts)
+
+def numpy_radix_sort(a, radix):
+    if not isinstance(radix, int) or not 2 <= radix <= RADIX_MAX:
+        raise ValueError(f'Radix must be an integer from 2 to {RADIX_MAX}, got {radix}')
+    if a.size == 0:
+        return a
+    if a.dtype.kind not in 'iu':
+        raise ValueError('Radix sort needs integer keys')
+    
+    # Bias by the minimum in wrapping uint64 arithmetic, so negatives sort too
+    bias = np.uint64(int(a.min()) % (1 << 64))
+    keys = a.astype(np.uint64) - bias
+    max_key = int(keys.max())
+    
+    exp = 1
+    while exp <= max_key:
+        digits = (keys // np.uint64(exp)) % np.uint64(radix)
+        keys = keys[np.argsort(digits, kind='stable')]
+        exp *= radix
+    
+    return (keys + bias).view(np.int64).astype(a.dtype)
+
+def numpy_bucket_sort(a):
+    n = a.size
+    if n == 0:
+        return a
+    # Same sample-quantile buckets as bucket_sort, placed with searchsorted
+    step = max(1, n // BUCKET_SAMPLE_SIZE)
+    sample = np.sort(a[::step])
+    bucket_count = max(1, min(n // BUCKET_TARGET_SIZE, sample.size))
+    boundaries = np.unique(sample[np.arange(1, bucket_count) * sample.size // bucket_count])
+    bucket_ids = np.searchsorted(boundaries, a, side='right')
+    return a[np.lexsort((a, bucket_ids))]
+
+# =================== BATCH SORTING ===================
+# /api/sort/batch fans a matrix of (array, algorithm) jobs out over a process
+# pool, so a comparison run uses every core instead of one GIL-bound worker.
+BATCH_MAX_JOBS = 256
+BATCH_DEFAULT_TIMEOUT = 30
+BATCH_MAX_TIMEOUT = 60
+# Trace ops one batch may return in total; jobs split it evenly
+BATCH_MAX_TRACE_OPS = 4 * SORT_MAX_TRACE_OPS
+BATCH_WORKERS = os.cpu_count() or 1
+
+batch_pool = None
+
+def get_batch_pool():
+    global batch_pool
+    if batch_pool is None:
+        batch_pool = ProcessPoolExecutor(max_workers=BATCH_WORKERS)
+    return batch_pool
+
+def run_sort_job(algo, array, options, mode, timeout, progress=None, max_ops=SORT_MAX_TRACE_OPS):
+    """Run one batch job in a worker process; errors are reported, never raised"""
+    start = time.perf_counter()
+    try:
+        if options.get('engine') == 'numpy':
+            if np is None:
+                raise ValueError('The NumPy engine is not available: numpy is not installed')
+            result = run_numpy_engine(algo, array, options.get('radix', NUMPY_RADIX))
+        else:
+            budget = TraceBudget(timeout, None if mode == 'stats' else max_ops, progress)
+            ops = budget.limit(build_sorter(algo, array[:], options))
+            if mode == 'stats':
+                result = {'stats': collect_stats(ops, algo, len(array))}
+            elif options.get('format') == 'packed':
+                result = {'trace': pack_ops(ops)}
+            else:
+                result = {'ops': [op_to_dict(op) for op in ops]}
+            if budget.truncated:
+                result['truncated'] = True
+                result['truncatedBy'] = budget.truncated
+    except JobCancelled:
+        raise
+    except Exception as e:
+        result = {'error': str(e)}
+    result['elapsedMs'] = round((time.perf_counter() - start) * 1000, 3)
+    return result
+
+@app.route('/api/sort/batch', methods=['POST'])
+def sort_batch():
+    try:
+        data = request.json
+        arrays = data.get('arrays', [])
+        algos = data.get('algos', [])
+        mode = data.get('mode', 'stats')
+        options = data.get('options', {})
+        timeout = data.get('timeout', BATCH_DEFAULT_TIMEOUT)
+        
+        if mode not in ('trace', 'stats'):
+            return jsonify({'error': f'Unknown batch mode: {mode}'}), 400
+        if not isinstance(timeout, (int, float)) or timeout <= 0:
+            return jsonify({'error': 'timeout must be a positive number of seconds'}), 400
+        timeout = min(timeout, BATCH_MAX_TIMEOUT)
+        jobs = [(index, algo) for index in range(len(arrays)) for algo in algos]
+        if len(jobs) > BATCH_MAX_JOBS:
+            return jsonify({'error': f'Batch has {len(jobs)} jobs; the limit is {BATCH_MAX_JOBS}'}), 400
+        if options.get('engine') != 'numpy':
+            for index, algo in jobs:
+                descriptor = ALGORITHMS['sort'].get(algo)
+                if descriptor is not None:
+                    check_input_size(descriptor, algo, len(arrays[index]))
+        max_ops = min(SORT_MAX_TRACE_OPS, BATCH_MAX_TRACE_OPS // max(len(jobs), 1))
+        
+        start = time.perf_counter()
+        pool = get_batch_pool()
+        futures = [pool.submit(run_sort_job, algo, arrays[index], options, mode, timeout, max_ops=max_ops)
+                   for index, algo in jobs]
+        
+        results = []
+        for (index, algo), future in zip(jobs, futures):
+            result = future.result()
+            # Batches compare engines, so the NumPy engine's sorted copy is dropped
+            result.pop('sorted', None)
+            result.update({'arrayIndex': index, 'algo': algo})
+            if 'stats' in result:
+                record_ops('/api/sort/batch', algo, result['stats']['totalOps'])
+            results.append(result)
+        
+        return jsonify({
+            'results': results,
+            'jobs': len(jobs),
+            'workers': BATCH_WORKERS,
+            'wallTimeMs': round((time.perf_counter() - start) * 1000, 3)
+        })
+    except InputTooLarge as e:
+        return jsonify({'error': str(e)}), 413
+    except Exception as e:
+        return jsonify({'error': str(e)}), 400
+
+# =================== JOBS ===================
+# Long runs go through /api/jobs instead of holding a request open. A job runs
+# in a process pool and keeps its state in JOB_DIR as one JSON file, so any
+# server process (serve.py forks several) can report on it or cancel it.
+# The request goes to the worker as an argument and never into the file, so
+# the rewrites every JOB_PROGRESS_INTERVAL seconds (and the polls reading
+# them) only carry status and progress. Workers check for a cancel marker
+# at the same time.
+JOB_DIR = os.path.join(tempfile.gettempdir(), 'algorithms-jobs')
+JOB_KINDS = ('sort', 'crypto', 'more')
+JOB_WORKERS = os.cpu_count() or 1
+JOB_TIME_LIMIT = 600
+JOB_PROGRESS_INTERVAL = 0.25
+# Finished jobs are deleted this many seconds after they end
+JOB_TTL = 3600
+JOB_ID_PATTERN = re.compile(r'^[0-9a-f]{32}$')
+
+job_pool = None
+job_futures = {}  # job id -> Future, for jobs submitted by this process
+
+class JobCancelled(Exception):
+    pass
+
+def get_job_pool():
+    global job_pool
+    if job_pool is None:
+        job_pool = ProcessPoolExecutor(max_workers=JOB_WORKERS)
+    return job_pool
+
+def job_path(job_id, suffix='.json'):
+    return os.path.join(JOB_DIR, job_id + suffix)
+
+def write_job(job):
+    # Write-then-rename, so readers never see half a file
+    path = job_path(job['id'])
+    temp = f'{path}.{os.getpid()}.tmp'
+    with open(temp, 'w') as f:
+        json.dump(job, f)
+    os.replace(temp, path)
+
+def read_job(job_id):
+    try:
+        with open(job_path(job_id)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+def prune_jobs():
+    cutoff = time.time() - JOB_TTL
+    for name in os.listdir(JOB_DIR):
+        path = os.path.join(JOB_DIR, name)
+        try:
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+        except OSError:
+            pass
+
+class JobProgress:
+    """Progress callback handed to a running job: progress(done, total)"""
+    def __init__(self, job, unit):
+        self.job = job
+        self.unit = unit
+        self.cancel_path = job_path(job['id'], '.cancel')
+        self.last_write = 0
+        self.done = 0
+        self.total = None
+    
+    def __call__(self, done, total=None, force=False):
+        self.done = done
+        self.total = total
+        now = time.monotonic()
+        if not force and now - self.last_write < JOB_PROGRESS_INTERVAL:
+            return
+        self.last_write = now
+        if os.path.exists(self.cancel_path):
+            raise JobCancelled()
+        self.record()
+        write_job(self.job)
+    
+    def record(self, percent=None):
+        if percent is None and self.total:
+            # Totals are often estimates, so only a finished job shows 100%
+            percent = round(min(self.done / self.total * 100, 99), 1)
+        self.job['progress'] = {'done': self.done, 'total': self.total, 'unit': self.unit, 'percent': percent}
+
+def run_sort_task(data, progress):
+    algo = data.get('algo')
+    array = data.get('array', [])
+    total = lookup_algorithm('sort', algo)['cost'](len(array), data)
+    result = run_sort_job(algo, array, data, data.get('mode', 'stats'), JOB_TIME_LIMIT,
+                          progress=lambda count: progress(count, total))
+    if 'error' in result:
+        raise ValueError(result['error'])
+    return result
+
+def run_crypto_task(data, progress):
+    descriptor = lookup_algorithm('crypto', data.get('algorithm', 'caesar'))
+    steps = []
+    details = []
+    result = run_cipher(descriptor, data, steps, details, progress)
+    return {'result': result, 'steps': steps, 'details': details}
+
+def run_more_task(data, progress):
+    descriptor = lookup_algorithm('more', data.get('algo'))
+    kwargs = {'progress': progress} if descriptor['reportsProgress'] else {}
+    with app.app_context():
+        response = descriptor['fn'](data, **kwargs)
+        status = 200
+        if isinstance(response, tuple):
+            response, status = response
+        body = response.get_json()
+    if status >= 400:
+        raise ValueError(body.get('error', f'HTTP {status}'))
+    return body
+
+JOB_TASKS = {'sort': (run_sort_task, 'ops'), 'crypto': (run_crypto_task, 'steps'),
+             'more': (run_more_task, 'steps')}
+
+def run_job(job, data):
+    """Run one job in a pool process, recording every state change in its file"""
+    task, unit = JOB_TASKS[job['kind']]
+    progress = JobProgress(job, unit)
+    try:
+        job['status'] = 'running'
+        job['startedAt'] = time.time()
+        progress(0, force=True)
+        job['result'] = task(data, progress)
+        job['status'] = 'done'
+        progress.record(100)
+    except JobCancelled:
+        job['status'] = 'cancelled'
+        progress.record()
+    except Exception as e:
+        job['status'] = 'failed'
+        job['error'] = str(e)
+    job['finishedAt'] = time.time()
+    write_job(job)
+
+def validate_job(kind, data):
+    """Reject a bad job before it is queued, with the same checks the direct routes make"""
+    if kind == 'sort':
+        algo = data.get('algo')
+        descriptor = lookup_algorithm('sort', algo)
+        if data.get('engine', 'python') != 'numpy':
+            check_input_size(descriptor, algo, len(data.get('array', [])), job=True)
+        if data.get('mode', 'stats') not in ('trace', 'stats'):
+            raise ValueError(f"Unknown job mode: {data.get('mode')}")
+    elif kind == 'crypto':
+        algorithm = data.get('algorithm', 'caesar')
+        if not data.get('input'):
+            raise ValueError('Input text is required')
+        check_input_size(lookup_algorithm('crypto', algorithm), algorithm, len(data['input']), job=True)
+    else:
+        lookup_algorithm('more', data.get('algo'))
+
+@app.route('/api/jobs', methods=['POST'])
+def create_job():
+    try:
+        data = request.json
+        kind = data.get('kind')
+        if kind not in JOB_KINDS:
+            return jsonify({'error': f'Unknown job kind: {kind}'}), 400
+        validate_job(kind, data)
+        
+        os.makedirs(JOB_DIR, exist_ok=True)
+        prune_jobs()
+        job = {
+            'id': uuid.uuid4().hex,
+            'kind': kind,
+            'algo': data.get('algo') or data.get('algorithm'),
+            'status': 'queued',
+            'progress': None,
+            'createdAt': time.time()
+        }
+        write_job(job)
+        future = get_job_pool().submit(run_job, job, data)
+        job_futures[job['id']] = future
+        future.add_done_callback(lambda done: job_futures.pop(job['id'], None))
+        return jsonify(job), 202
+    except InputTooLarge as e:
+        return jsonify({'error': str(e)}), 413
+    except Exception as e:
+        return jsonify({'error': str(e)}), 400
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    job = read_job(job_id) if JOB_ID_PATTERN.match(job_id) else None
+    if job is None:
+        return jsonify({'error': f'Unknown job: {job_id}'}), 404
+    return jsonify(job)
+
+@app.route('/api/jobs/<job_id>', methods=['DELETE'])
+def cancel_job(job_id):
+    job = read_job(job_id) if JOB_ID_PATTERN.match(job_id) else None
+    if job is None:
+        return jsonify({'error': f'Unknown job: {job_id}'}), 404
+    if job['status'] in ('done', 'failed', 'cancelled'):
+        return jsonify(job)
+    
+    future = job_futures.get(job_id)
+    if future is not None and future.cancel():
+        # Still queued in this process's pool, so it will never start
+        job['status'] = 'cancelled'
+        job['finishedAt'] = time.time()
+        write_job(job)
+        return jsonify(job)
+    
+    # Queued elsewhere or already running: the worker stops at its next progress check
+    open(job_path(job_id, '.cancel'), 'w').close()
+    job['status'] = 'cancelling'
+    return jsonify(job), 202
 
 # =================== GREEDY ALGORITHMS ===================
 # Activity Selection
+# 'select' is the classic unweighted pick of the most compatible activities;
+# 'weighted' maximises total weight (sort by end + binary-search DP) and
+# 'rooms' partitions every interval into the fewest rooms (min-heap of end times).
+ACTIVITY_MODES = ('select', 'weighted', 'rooms')
+
+def parse_intervals(raw, weighted=False):
+    """Intervals as [(start, end, weight)] from "s,e[,w];..." or a JSON array.
+
+    Array entries are [start, end], [start, end, weight] or objects with
+    start/end/weight keys; the weight defaults to 1.
+    """
+    if isinstance(raw, str):
+        rows = [pair.split(',') for pair in raw.split(';') if pair.strip()]
+        rows = [[int(field) for field in row] for row in rows]
+    elif isinstance(raw, list):
+        rows = [([row.get('start'), row.get('end'), row['weight']] if 'weight' in row
+                 else [row.get('start'), row.get('end')]) if isinstance(row, dict) else row
+                for row in raw]
+    else:
+        raise ValueError('activities must be a "start,end;..." string or a JSON array')
+    
+    # Exact type checks keep bulk posts cheap (and reject booleans)
+    numbers = (int, float)
+    intervals = []
+    for row in rows:
+        if type(row) is list and len(row) == 2:
+            start, end = row
+            weight = 1
+        elif type(row) is list and len(row) == 3 and weighted:
+            start, end, weight = row
+        else:
+            raise ValueError(f'Invalid interval: {row}')
+        if type(start) not in numbers or type(end) not in numbers or type(weight) not in numbers:
+            raise ValueError(f'Invalid interval: {row}')
+        intervals.append((start, end, weight))
+    return intervals
+
 @app.route('/api/greedy/activity', methods=['POST'])
 def activity_selection():
     try:
         data = request.json
-        activities_str = data.get('activities', '')
+        mode = data.get('mode', 'select')
+        # Step narration is one line per activity; large inputs can switch it off
+        narrate = data.get('narrate', True)
         
-        # Parse activities: "start1,end1;start2,end2;..."
-        activities = []
-        for pair in activities_str.split(';'):
-            if pair.strip():
-                start, end = map(int, pair.split(','))
-                activities.append((start, end))
+        if mode not in ACTIVITY_MODES:
+            return jsonify({'error': f'Unknown activity mode: {mode}'}), 400
+        
+        activities = parse_intervals(data.get('activities', ''), weighted=mode == 'weighted')
+        if mode == 'weighted':
+            return jsonify(weighted_interval_scheduling(activities, narrate))
+        if mode == 'rooms':
+            return jsonify(interval_partitioning(activities, narrate))
         
         # Sort by end time
         activities.sort(key=lambda x: x[1])
@@ -378,14 +2297,18 @@ def activity_selection():
         steps = []
         last_end = -1
         
-        for i, (start, end) in enumerate(activities):
+        for i, (start, end, _) in enumerate(activities):
             if start >= last_end:
                 selected.append(f"({start},{end})")
-                steps.append(f"Select activity ({start},{end}) - starts after previous ends")
+                if narrate:
+                    steps.append(f"Select activity ({start},{end}) - starts after previous ends")
                 last_end = end
-            else:
+            elif narrate:
                 steps.append(f"Skip activity ({start},{end}) - overlaps with previous")
         
+        if not narrate:
+            steps.append(f"Selected {len(selected)} of {len(activities)} activities")
+        
         return jsonify({
             'selected': selected,
             'count': len(selected),
@@ -394,13 +2317,107 @@ def activity_selection():
     except Exception as e:
         return jsonify({'error': str(e)}), 400
 
-# 0/1 Knapsack (Greedy by value-to-weight ratio)
+def check_intervals(activities):
+    for start, end, _ in activities:
+        if end < start:
+            raise ValueError(f'Activity ({start},{end}) ends before it starts')
+
+def weighted_interval_scheduling(activities, narrate=True):
+    """Maximum-weight set of compatible intervals in O(n log n)"""
+    check_intervals(activities)
+    # Ties on end time go by start, so a zero-length interval comes after every
+    # interval that ends at its point and the binary search sees all of them
+    order = sorted(range(len(activities)), key=lambda i: (activities[i][1], activities[i][0]))
+    ends = [activities[i][1] for i in order]
+    
+    # best[j] is the optimum over the first j intervals by end time; an interval
+    # is compatible with every earlier one that ends by its start
+    best = [0] * (len(order) + 1)
+    previous = [0] * len(order)
+    for j, i in enumerate(order):
+        start, _, weight = activities[i]
+        previous[j] = bisect_right(ends, start, 0, j)
+        best[j + 1] = max(best[j], weight + best[previous[j]])
+    
+    chosen = []
+    j = len(order)
+    while j > 0:
+        i = order[j - 1]
+        if activities[i][2] + best[previous[j - 1]] > best[j - 1]:
+            chosen.append(i)
+            j = previous[j - 1]
+        else:
+            j -= 1
+    chosen.reverse()
+    
+    steps = [f"Sorted {len(activities)} activities by end time; best[j] = max(best[j-1], w_j + best[p(j)])"]
+    if narrate:
+        for i in chosen:
+            start, end, weight = activities[i]
+            steps.append(f"Select activity ({start},{end}) weight {weight}")
+    steps.append(f"Total weight {best[-1]} from {len(chosen)} activities")
+    
+    return {
+        'selected': [f"({activities[i][0]},{activities[i][1]})" for i in chosen],
+        'selectedIndices': chosen,
+        'totalWeight': best[-1],
+        'count': len(chosen),
+        'steps': steps
+    }
+
+def interval_partitioning(activities, narrate=True):
+    """Assign every interval to a room using the fewest rooms"""
+    check_intervals(activities)
+    order = sorted(range(len(activities)), key=lambda i: activities[i][0])
+    assignment = [0] * len(activities)
+    rooms = []  # min-heap of (end time, room)
+    steps = []
+    
+    for i in order:
+        start, end, _ = activities[i]
+        if rooms and rooms[0][0] <= start:
+            # The room that frees up earliest is free already
+            room = rooms[0][1]
+            heapq.heapreplace(rooms, (end, room))
+            if narrate:
+                steps.append(f"Activity ({start},{end}) reuses room {room + 1}")
+        else:
+            room = len(rooms)
+            heapq.heappush(rooms, (end, room))
+            if narrate:
+                steps.append(f"Activity ({start},{end}) opens room {room + 1}")
+        assignment[i] = room
+    
+    steps.append(f"{len(activities)} activities fit in {len(rooms)} rooms")
+    return {
+        'rooms': len(rooms),
+        'assignment': assignment,
+        'count': len(rooms),
+        'steps': steps
+    }
+
+# 0/1 Knapsack
+# 'greedy' is the value-to-weight heuristic. The exact engines all return the
+# optimum: 'dp' (rolling array over capacity), 'mitm' (meet in the middle, for
+# few items with huge capacities) and 'bnb' (branch and bound on the greedy
+# ratio order). 'auto' picks whichever of them fits the input.
+KNAPSACK_ENGINES = ('greedy', 'dp', 'mitm', 'bnb', 'auto')
+# The DP keeps one take/skip flag per item and capacity for reconstruction
+KNAPSACK_DP_MAX_CELLS = 50000000
+KNAPSACK_MITM_MAX_N = 40
+# Past this many nodes branch and bound returns its best so far, flagged inexact
+KNAPSACK_BNB_MAX_NODES = 2000000
+
 @app.route('/api/greedy/knapsack', methods=['POST'])
 def knapsack_greedy():
     try:
         data = request.json
         items_str = data.get('items', '')
         capacity = data.get('capacity', 0)
+        engine = data.get('engine', 'greedy')
+        
+        if engine not in KNAPSACK_ENGINES:
+            return jsonify({'error': f'Unknown knapsack engine: {engine}'}), 400
         
         # Parse items: "weight,value;weight,value;..."
         items = []
@@ -410,9 +2427,13 @@ def knapsack_greedy():
                 items.append({
                     'weight': weight,
                     'value': value,
-                    'ratio': value / weight
+                    'ratio': value / weight,
+                    'index': len(items)
                 })
         
+        if engine != 'greedy':
+            return jsonify(knapsack_exact(items, capacity, engine))
+        
         # Sort by value-to-weight ratio (descending)
         items.sort(key=lambda x: x['ratio'], reverse=True)
         
@@ -438,6 +2459,249 @@ def knapsack_greedy():
     except Exception as e:
         return jsonify({'error': str(e)}), 400
 
+def knapsack_greedy_value(items, capacity):
+    current_weight = 0
+    total_value = 0
+    for item in sorted(items, key=lambda x: x['ratio'], reverse=True):
+        if current_weight + item['weight'] <= capacity:
+            current_weight += item['weight']
+            total_value += item['value']
+    return total_value
+
+def knapsack_exact(items, capacity, engine):
+    """Solve 0/1 knapsack exactly; items are labelled by their input position"""
+    if any(item['weight'] <= 0 for item in items):
+        raise ValueError('Item weights must be positive')
+    # Items heavier than the knapsack or worth nothing can never help
+    usable = [item for item in items if item['weight'] <= capacity and item['value'] > 0]
+    
+    if engine == 'auto':
+        if len(usable) * (capacity + 1) <= KNAPSACK_DP_MAX_CELLS:
+            engine = 'dp'
+        elif len(usable) <= KNAPSACK_MITM_MAX_N:
+            engine = 'mitm'
+        else:
+            engine = 'bnb'
+    
+    start = time.perf_counter()
+    if engine == 'dp':
+        chosen, stats = knapsack_dp(usable, capacity)
+    elif engine == 'mitm':
+        chosen, stats = knapsack_meet_in_middle(usable, capacity)
+    else:
+        chosen, stats = knapsack_branch_and_bound(usable, capacity)
+    elapsed = time.perf_counter() - start
+    
+    chosen.sort(key=lambda item: item['index'])
+    total_value = sum(item['value'] for item in chosen)
+    total_weight = sum(item['weight'] for item in chosen)
+    greedy_value = knapsack_greedy_value(items, capacity)
+    
+    steps = [f"Engine: {engine} over {len(usable)} usable items (of {len(items)}), capacity {capacity}"]
+    steps.extend(stats.pop('notes'))
+    for item in chosen:
+        steps.append(f"Take Item{item['index']+1} - weight:{item['weight']}, value:{item['value']}")
+    steps.append(f"Optimal value {total_value} at weight {total_weight}; greedy ratio order gets {greedy_value}")
+    
+    result = {
+        'maxValue': total_value,
+        'totalWeight': total_weight,
+        'selectedItems': [f"Item{item['index']+1}(w:{item['weight']},v:{item['value']})" for item in chosen],
+        'selectedIndices': [item['index'] for item in chosen],
+        'greedyValue': greedy_value,
+        'engine': engine,
+        'optimal': True,
+        'timeMs': round(elapsed * 1000, 3),
+        'steps': steps
+    }
+    result.update(stats)
+    return result
+
+def knapsack_dp(items, capacity):
+    """Bottom-up DP over capacities 0..capacity with one rolling value row"""
+    n = len(items)
+    if n * (capacity + 1) > KNAPSACK_DP_MAX_CELLS:
+        raise ValueError(f'The DP table would need {n * (capacity + 1)} cells '
+                         f'(limit {KNAPSACK_DP_MAX_CELLS}); use the mitm or bnb engine')
+    
+    if np is not None:
+        best = np.zeros(capacity + 1, dtype=np.int64)
+        take = np.zeros((n, capacity + 1), dtype=bool)
+        for i, item in enumerate(items):
+            w, v = item['weight'], item['value']
+            # The right-hand side is built from the previous row before best is written
+            candidate = best[:capacity + 1 - w] + v
+            better = candidate > best[w:]
+            take[i, w:] = better
+            best[w:] = np.where(better, candidate, best[w:])
+        memory = best.nbytes + take.nbytes
+    else:
+        best = [0] * (capacity + 1)
+        take = []
+        for item in items:
+            w, v = item['weight'], item['value']
+            row = bytearray(capacity + 1)
+            # Descending capacities read only values from the previous item
+            for c in range(capacity, w - 1, -1):
+                candidate = best[c - w] + v
+                if candidate > best[c]:
+                    best[c] = candidate
+                    row[c] = 1
+            take.append(row)
+        memory = 8 * (capacity + 1) + n * (capacity + 1)
+    
+    chosen = []
+    c = capacity
+    for i in range(n - 1, -1, -1):
+        if take[i][c]:
+            chosen.append(items[i])
+            c -= items[i]['weight']
+    
+    notes = [f"DP over {n} items x {capacity + 1} capacities"
+             f"{' (NumPy row updates)' if np is not None else ''}"]
+    return chosen, {'memoryBytes': int(memory), 'notes': notes}
+
+def knapsack_subsets(items):
+    """(weights, values) of every subset; subset k takes item j when bit j of k is set"""
+    weights = [0]
+    values = [0]
+    for item in items:
+        weights += [w + item['weight'] for w in weights]
+        values += [v + item['value'] for v in values]
+    return weights, values
+
+def knapsack_meet_in_middle(items, capacity):
+    """Split the items in half, enumerate both halves and pair them with a binary search"""
+    n = len(items)
+    if n > KNAPSACK_MITM_MAX_N:
+        raise ValueError(f'Meet in the middle handles at most {KNAPSACK_MITM_MAX_N} items; got {n}')
+    left, right = items[:n // 2], items[n // 2:]
+    subsets = 2 ** len(left) + 2 ** len(right)
+    notes = [f"Enumerated 2^{len(left)} + 2^{len(right)} = {subsets} half-subsets"]
+    
+    if np is not None and sum(item['weight'] for item in items) < 2 ** 62 \
+            and sum(item['value'] for item in items) < 2 ** 62:
+        left_mask, right_mask, memory = knapsack_meet_in_middle_numpy(left, right, capacity)
+        chosen = [item for j, item in enumerate(left) if left_mask >> j & 1]
+        chosen += [item for j, item in enumerate(right) if right_mask >> j & 1]
+        notes[0] += ' (NumPy)'
+        return chosen, {'memoryBytes': memory, 'notes': notes}
+    
+    left_weights, left_values = knapsack_subsets(left)
+    right_weights, right_values = knapsack_subsets(right)
+    
+    # Sort the right half by weight and keep, for each prefix, its most valuable subset
+    order = sorted(range(len(right_weights)), key=right_weights.__getitem__)
+    sorted_weights = [right_weights[k] for k in order]
+    best_masks = []
+    best_mask, best_value = 0, -1
+    for k in order:
+        if right_values[k] > best_value:
+            best_mask, best_value = k, right_values[k]
+        best_masks.append(best_mask)
+    
+    best_total, best_pair = 0, (0, 0)
+    for mask, (weight, value) in enumerate(zip(left_weights, left_values)):
+        if weight > capacity:
+            continue
+        j = bisect_right(sorted_weights, capacity - weight) - 1
+        right_mask = best_masks[j]
+        total = value + right_values[right_mask]
+        if total > best_total:
+            best_total, best_pair = total, (mask, right_mask)
+    
+    left_mask, right_mask = best_pair
+    chosen = [item for j, item in enumerate(left) if left_mask >> j & 1]
+    chosen += [item for j, item in enumerate(right) if right_mask >> j & 1]
+    
+    # Two ints per enumerated subset, plus the sort order and prefix-best columns
+    memory = subsets * 2 * 28 + len(right_weights) * 3 * 8
+    return chosen, {'memoryBytes': memory, 'notes': notes}
+
+def knapsack_meet_in_middle_numpy(left, right, capacity):
+    """Vectorised meet in the middle; returns the two subset masks and the bytes used"""
+    def subsets(half):
+        weights = np.zeros(1, dtype=np.int64)
+        values = np.zeros(1, dtype=np.int64)
+        for item in half:
+            weights = np.concatenate((weights, weights + item['weight']))
+            values = np.concatenate((values, values + item['value']))
+        return weights, values
+    
+    left_weights, left_values = subsets(left)
+    right_weights, right_values = subsets(right)
+    order = np.argsort(right_weights, kind='stable')
+    sorted_weights = right_weights[order]
+    sorted_values = right_values[order]
+    # Position of the most valuable subset within each weight-sorted prefix
+    best_at = np.maximum.accumulate(np.where(
+        sorted_values == np.maximum.accumulate(sorted_values), np.arange(len(order)), 0))
+    
+    fits = np.flatnonzero(left_weights <= capacity)
+    j = np.searchsorted(sorted_weights, capacity - left_weights[fits], side='right') - 1
+    totals = left_values[fits] + sorted_values[best_at[j]]
+    k = int(np.argmax(totals))
+    memory = (left_weights.nbytes + left_values.nbytes + right_weights.nbytes + right_values.nbytes
+              + order.nbytes + sorted_weights.nbytes + sorted_values.nbytes + best_at.nbytes
+              + fits.nbytes + j.nbytes + totals.nbytes)
+    return int(fits[k]), int(order[best_at[j[k]]]), int(memory)
+
+def knapsack_branch_and_bound(items, capacity):
+    """Depth-first branch and bound in greedy ratio order with the fractional bound"""
+    order = sorted(items, key=lambda x: x['ratio'], reverse=True)
+    n = len(order)
+    prefix_weight = [0]
+    prefix_value = [0]
+    for item in order:
+        prefix_weight.append(prefix_weight[-1] + item['weight'])
+        prefix_value.append(prefix_value[-1] + item['value'])
+    
+    def upper_bound(i, weight, value):
+        # Whole items i..k-1 fit; item k (if any) contributes a fraction
+        k = bisect_right(prefix_weight, prefix_weight[i] + capacity - weight) - 1
+        bound = value + prefix_value[k] - prefix_value[i]
+        if k < n:
+            room = capacity - weight - (prefix_weight[k] - prefix_weight[i])
+            bound += room * order[k]['ratio']
+        return bound
+    
+    # Seed with the greedy answer so pruning starts immediately
+    best_value, best_taken = 0, 0
+    weight = 0
+    for j, item in enumerate(order):
+        if weight + item['weight'] <= capacity:
+            weight += item['weight']
+            best_value += item['value']
+            best_taken |= 1 << j
+    
+    nodes = 0
+    max_stack = 1
+    optimal = True
+    stack = [(0, 0, 0, 0)]  # (next item, weight, value, taken bitmask)
+    while stack:
+        i, weight, value, taken = stack.pop()
+        nodes += 1
+        if nodes > KNAPSACK_BNB_MAX_NODES:
+            optimal = False
+            break
+        if value > best_value:
+            best_value, best_taken = value, taken
+        if i == n or upper_bound(i, weight, value) <= best_value:
+            continue
+        # Push skip first so the take branch is explored first
+        stack.append((i + 1, weight, value, taken))
+        if weight + order[i]['weight'] <= capacity:
+            stack.append((i + 1, weight + order[i]['weight'], value + order[i]['value'], taken | 1 << i))
+        max_stack = max(max_stack, len(stack))
+    
+    chosen = [item for j, item in enumerate(order) if best_taken >> j & 1]
+    notes = [f"Explored {nodes} nodes with a fractional (greedy ratio) upper bound"]
+    if not optimal:
+        notes.append(f"Stopped at {KNAPSACK_BNB_MAX_NODES} nodes; the answer is the best found, not proven optimal")
+    # Each stack entry is a 4-tuple of ints
+    memory = max_stack * (56 + 4 * 28) + 2 * (n + 1) * 8
+    return chosen, {'memoryBytes': memory, 'nodes': nodes, 'optimal': optimal, 'notes': notes}
+
 # Egyptian Fractions
 @app.route('/api/greedy/egyptian', methods=['POST'])
 def egyptian_fractions():
@@ -481,11 +2745,28 @@ def gcd(a, b):
     return a
 
 # Job Sequencing
+# Free slots live in a sparse union-find: a taken slot points at the slot before
+# it, so following parents from a deadline lands on the latest free slot. Only
+# slots that were actually taken get an entry, so memory is O(n) however large
+# the deadlines are, and path compression keeps each lookup near O(1).
+def latest_free_slot(parent, t):
+    """Latest free slot at or before t, or 0 if every earlier slot is taken"""
+    if t < 1:
+        return 0
+    root = t
+    while root in parent:
+        root = parent[root]
+    while t != root:
+        parent[t], t = root, parent[t]
+    return root
+
 @app.route('/api/greedy/job-sequencing', methods=['POST'])
 def job_sequencing():
     try:
         data = request.json
         jobs_str = data.get('jobs', '')
+        # Step narration is one line per job; large inputs can switch it off
+        narrate = data.get('narrate', True)
         
         # Parse jobs: "id,deadline,profit;id,deadline,profit;..."
         jobs = []
@@ -501,24 +2782,26 @@ def job_sequencing():
         # Sort jobs by profit (descending)
         jobs.sort(key=lambda x: x['profit'], reverse=True)
         
-        max_deadline = max(job['deadline'] for job in jobs) if jobs else 0
-        timeline = [None] * (max_deadline + 1)
+        parent = {}
         total_profit = 0
         sequence = []
         steps = []
         
         for job in jobs:
             # Find a slot for this job
-            for t in range(job['deadline'], 0, -1):
-                if timeline[t] is None:
-                    timeline[t] = job
-                    sequence.append(job['id'])
-                    total_profit += job['profit']
+            t = latest_free_slot(parent, job['deadline'])
+            if t:
+                parent[t] = t - 1
+                sequence.append(job['id'])
+                total_profit += job['profit']
+                if narrate:
                     steps.append(f"Schedule job {job['id']} at time {t} (profit: {job['profit']})")
-                    break
-            else:
+            elif narrate:
                 steps.append(f"Cannot schedule job {job['id']} - no available slot")
         
+        if not narrate:
+            steps.append(f"Scheduled {len(sequence)} of {len(jobs)} jobs")
+        
         return jsonify({
             'maxProfit': total_profit,
             'sequence': sequence,
@@ -620,6 +2903,439 @@ def huffman_coding():
     except Exception as e:
         return jsonify({'error': str(e)}), 400
 
+# Huffman coding engine
+# The route above narrates the textbook heap build for the visualiser. The
+# functions below are the fast path over byte payloads: code lengths from a
+# two-queue build (or package-merge when a length limit is set), canonical
+# codes, a chunked bit-packing encoder and a table-driven decoder.
+HUFFMAN_MAX_BYTES = 32 << 20
+# The encoder builds a '0'/'1' string per call, so payloads go in slices this big
+HUFFMAN_CHUNK_BYTES = 256 << 10
+# 256 symbols never need a code longer than 255 bits, which also fits in a byte
+HUFFMAN_MAX_CODE_LENGTH = 255
+
+def byte_frequencies(data, counts=None):
+    """Add the byte counts of data into a 256-entry list"""
+    if counts is None:
+        counts = [0] * 256
+    if np is not None:
+        values = np.frombuffer(data, dtype=np.uint8)
+        # bincount widens its input to intp, so count in slices to bound that copy
+        total = np.zeros(256, dtype=np.int64)
+        for i in range(0, len(values), HUFFMAN_CHUNK_BYTES):
+            total += np.bincount(values[i:i + HUFFMAN_CHUNK_BYTES], minlength=256)
+        for symbol, count in enumerate(total.tolist()):
+            counts[symbol] += count
+    else:
+        for symbol in set(data):
+            counts[symbol] += data.count(symbol)
+    return counts
+
+def huffman_code_lengths(counts):
+    """Optimal code length per symbol, in linear time over the sorted frequencies.
+
+    Leaves are consumed in frequency order from one queue; merged nodes are
+    created in non-decreasing weight order, so they form a second sorted queue
+    and the two smallest nodes are always at the queue heads.
+    """
+    symbols = sorted((count, symbol) for symbol, count in enumerate(counts) if count)
+    lengths = [0] * len(counts)
+    n = len(symbols)
+    if n == 1:
+        lengths[symbols[0][1]] = 1
+    if n <= 1:
+        return lengths
+    
+    weight = [count for count, _ in symbols]
+    parent = [0] * (2 * n - 1)
+    leaf, node = 0, n
+    for new in range(n, 2 * n - 1):
+        total = 0
+        for _ in range(2):
+            if leaf < n and (node == new or weight[leaf] <= weight[node]):
+                child, leaf = leaf, leaf + 1
+            else:
+                child, node = node, node + 1
+            parent[child] = new
+            total += weight[child]
+        weight.append(total)
+    
+    # Every node is created after its children, so one backwards pass sets depths
+    depth = [0] * (2 * n - 1)
+    for i in range(2 * n - 3, -1, -1):
+        depth[i] = depth[parent[i]] + 1
+    for i, (_, symbol) in enumerate(symbols):
+        lengths[symbol] = depth[i]
+    return lengths
+
+def package_merge_lengths(counts, max_length):
+    """Optimal code lengths no longer than max_length bits (package-merge)"""
+    symbols = sorted((count, symbol) for symbol, count in enumerate(counts) if count)
+    n = len(symbols)
+    if n <= 1:
+        return huffman_code_lengths(counts)
+    if (1 << max_length) < n:
+        raise ValueError(f'{n} symbols need codes of at least {(n - 1).bit_length()} bits')
+    
+    # Each item is (weight, leaves it contains); a leaf's code length is the
+    # number of the 2n - 2 cheapest final items that contain it
+    leaves = [(count, (i,)) for i, (count, _) in enumerate(symbols)]
+    current = leaves
+    for _ in range(max_length - 1):
+        packages = [(current[k][0] + current[k + 1][0], current[k][1] + current[k + 1][1])
+                    for k in range(0, len(current) - 1, 2)]
+        current = list(heapq.merge(leaves, packages, key=lambda item: item[0]))
+    
+    lengths = [0] * len(counts)
+    for _, contained in current[:2 * n - 2]:
+        for i in contained:
+            lengths[symbols[i][1]] += 1
+    return lengths
+
+def canonical_codes(lengths):
+    """Canonical code per symbol as (code, length); codes count up in (length, symbol) order"""
+    codes = {}
+    code = 0
+    previous = 0
+    for length, symbol in sorted((length, symbol) for symbol, length in enumerate(lengths) if length):
+        code <<= length - previous
+        codes[symbol] = (code, length)
+        code += 1
+        previous = length
+    return codes
+
+def check_code_lengths(lengths):
+    # The Kraft sum and the trie both grow with the longest code, so bound it first
+    if not isinstance(lengths, list) or len(lengths) != 256 or \
+            any(not isinstance(length, int) or not 0 <= length <= HUFFMAN_MAX_CODE_LENGTH
+                for length in lengths):
+        raise ValueError(f'lengths must list 256 code lengths from 0 to {HUFFMAN_MAX_CODE_LENGTH}')
+    # Kraft inequality: the lengths must leave room for a prefix code
+    longest = max(lengths)
+    if sum(1 << (longest - length) for length in lengths if length) > 1 << longest:
+        raise ValueError('lengths do not form a prefix code')
+
+class HuffmanEncoder:
+    """Bit-pack byte chunks with a canonical code; call flush() after the last chunk"""
+    def __init__(self, lengths):
+        codes = canonical_codes(lengths)
+        self.table = [format(codes[s][0], f'0{codes[s][1]}b') if s in codes else None for s in range(256)]
+        self.pending = ''
+        self.bits = 0
+    
+    def encode(self, data):
+        try:
+            bits = self.pending + ''.join(map(self.table.__getitem__, data))
+        except TypeError:
+            raise ValueError('The payload has a byte with no code') from None
+        whole = len(bits) - len(bits) % 8
+        self.pending = bits[whole:]
+        self.bits += whole
+        return int(bits[:whole], 2).to_bytes(whole // 8, 'big') if whole else b''
+    
+    def flush(self):
+        """The last partial byte, zero-padded"""
+        self.bits += len(self.pending)
+        tail = self.pending.ljust(8, '0') if self.pending else ''
+        self.pending = ''
+        return int(tail, 2).to_bytes(1, 'big') if tail else b''
+
+class HuffmanDecoder:
+    """Table-driven decoder: one lookup per input byte.
+
+    The states are the internal nodes of the code trie. For every state and
+    input byte the table holds the symbols completed by those 8 bits and the
+    state after them; it is composed from a 4-bit table to keep the build cheap.
+    """
+    def __init__(self, lengths):
+        check_code_lengths(lengths)
+        # children[node][bit]: an internal node id, ~symbol for a leaf, or None
+        children = [[None, None]]
+        for symbol, (code, length) in canonical_codes(lengths).items():
+            node = 0
+            for shift in range(length - 1, 0, -1):
+                bit = code >> shift & 1
+                if children[node][bit] is None:
+                    children[node][bit] = len(children)
+                    children.append([None, None])
+                node = children[node][bit]
+            children[node][code & 1] = ~symbol
+        
+        nibbles = []
+        for state in range(len(children)):
+            row = []
+            for value in range(16):
+                node, out = state, bytearray()
+                for shift in (3, 2, 1, 0):
+                    child = children[node][value >> shift & 1]
+                    if child is None:
+                        row.append(None)
+                        break
+                    if child < 0:
+                        out.append(~child)
+                        node = 0
+                    else:
+                        node = child
+                else:
+                    row.append((bytes(out), node))
+            nibbles.append(row)
+        
+        self.emit = []
+        self.next = []
+        for state in range(len(children)):
+            for value in range(256):
+                high = nibbles[state][value >> 4]
+                low = nibbles[high[1]][value & 15] if high is not None else None
+                self.emit.append(high[0] + low[0] if low is not None else None)
+                self.next.append(low[1] if low is not None else 0)
+        self.state = 0
+    
+    def decode(self, data):
+        out = bytearray()
+        emit, following = self.emit, self.next
+        state = self.state
+        for value in data:
+            key = state << 8 | value
+            piece = emit[key]
+            if piece is None:
+                raise ValueError('The bit stream does not match the code')
+            out += piece
+            state = following[key]
+        self.state = state
+        return out
+
+def huffman_payload(data):
+    """The bytes to compress from a request: 'text' (UTF-8) or base64 'data'"""
+    if data.get('data') is not None:
+        payload = base64.b64decode(data['data'], validate=True)
+    else:
+        payload = str(data.get('text', '')).encode('utf-8')
+    if len(payload) > HUFFMAN_MAX_BYTES:
+        raise InputTooLarge(f'Payloads are limited to {HUFFMAN_MAX_BYTES} bytes; got {len(payload)}')
+    return payload
+
+def throughput(size, seconds):
+    return round(size / 1e6 / seconds, 2) if seconds > 0 else None
+
+@app.route('/api/greedy/huffman/encode', methods=['POST'])
+def huffman_encode():
+    try:
+        data = request.json
+        payload = huffman_payload(data)
+        max_length = data.get('maxLength')
+        
+        start = time.perf_counter()
+        counts = byte_frequencies(payload)
+        lengths = huffman_code_lengths(counts)
+        limited = max_length is not None and max(lengths) > int(max_length)
+        if limited:
+            lengths = package_merge_lengths(counts, int(max_length))
+        encoder = HuffmanEncoder(lengths)
+        view = memoryview(payload)
+        packed = [encoder.encode(view[i:i + HUFFMAN_CHUNK_BYTES])
+                  for i in range(0, len(payload), HUFFMAN_CHUNK_BYTES)]
+        packed.append(encoder.flush())
+        encoded = b''.join(packed)
+        elapsed = time.perf_counter() - start
+        
+        codes = canonical_codes(lengths)
+        result = {
+            'lengths': lengths,
+            'codes': {str(symbol): format(code, f'0{length}b') for symbol, (code, length) in codes.items()},
+            'encoded': base64.b64encode(encoded).decode('ascii'),
+            'symbols': len(payload),
+            'bitLength': encoder.bits,
+            'originalBytes': len(payload),
+            'compressedBytes': len(encoded),
+            'ratio': round(len(encoded) / len(payload), 4) if payload else None,
+            'averageBits': round(encoder.bits / len(payload), 4) if payload else None,
+            'maxCodeLength': max(lengths),
+            'lengthLimited': limited,
+            'encodeMs': round(elapsed * 1000, 3),
+            'throughputMBs': throughput(len(payload), elapsed)
+        }
+        
+        if data.get('verify'):
+            start = time.perf_counter()
+            decoded = HuffmanDecoder(lengths).decode(encoded)[:len(payload)]
+            elapsed = time.perf_counter() - start
+            result['verified'] = decoded == payload
+            result['decodeMs'] = round(elapsed * 1000, 3)
+            result['decodeThroughputMBs'] = throughput(len(payload), elapsed)
+        
+        return jsonify(result)
+    except InputTooLarge as e:
+        return jsonify({'error': str(e)}), 413
+    except Exception as e:
+        return jsonify({'error': str(e)}), 400
+
+@app.route('/api/greedy/huffman/decode', methods=['POST'])
+def huffman_decode():
+    try:
+        data = request.json
+        encoded = data.get('encoded', '')
+        lengths = data.get('lengths')
+        symbols = int(data.get('symbols', 0))
+        # Base64 carries 3 bytes in every 4 characters
+        if len(encoded) > HUFFMAN_MAX_BYTES // 3 * 4 + 4:
+            raise InputTooLarge(f'Encoded payloads are limited to {HUFFMAN_MAX_BYTES} bytes')
+        if not 0 <= symbols <= HUFFMAN_MAX_BYTES:
+            raise InputTooLarge(f'symbols must be between 0 and {HUFFMAN_MAX_BYTES}')
+        encoded = base64.b64decode(encoded, validate=True)
+        
+        start = time.perf_counter()
+        decoder = HuffmanDecoder(lengths)
+        decoded = bytearray()
+        # Short codes emit up to 8 symbols per byte, so stop once enough are out;
+        # padding bits may also decode to extra symbols past the real end
+        for i in range(0, len(encoded), HUFFMAN_CHUNK_BYTES):
+            if len(decoded) >= symbols:
+                break
+            decoded += decoder.decode(encoded[i:i + HUFFMAN_CHUNK_BYTES])
+        decoded = bytes(decoded[:symbols])
+        elapsed = time.perf_counter() - start
+        if len(decoded) < symbols:
+            raise ValueError(f'The bit stream holds only {len(decoded)} of {symbols} symbols')
+        
+        try:
+            text = decoded.decode('utf-8')
+        except UnicodeDecodeError:
+            text = None
+        return jsonify({
+            'data': base64.b64encode(decoded).decode('ascii'),
+            'text': text,
+            'decodedBytes': len(decoded),
+            'decodeMs': round(elapsed * 1000, 3),
+            'throughputMBs': throughput(len(decoded), elapsed)
+        })
+    except InputTooLarge as e:
+        return jsonify({'error': str(e)}), 413
+    except Exception as e:
+        return jsonify({'error': str(e)}), 400
+
+# Streaming Huffman compression
+# The raw request body (chunked uploads included) or a file under
+# HUFFMAN_FILE_ROOT is read twice in fixed-size chunks: once to count bytes,
+# once to encode. Uploads are spooled to a temporary file for the second pass,
+# so memory stays bounded by the chunk size whatever the input size.
+HUFFMAN_SPOOL_BYTES = 8 << 20
+HUFFMAN_STREAM_MAX_BYTES = 1 << 30
+# Reading server-side files is off unless this names the directory allowed
+HUFFMAN_FILE_ROOT = os.environ.get('HUFFMAN_FILE_ROOT')
+
+def read_chunks(source):
+    while True:
+        chunk = source.read(HUFFMAN_CHUNK_BYTES)
+        if not chunk:
+            return
+        yield chunk
+
+def resolve_huffman_path(path):
+    if not HUFFMAN_FILE_ROOT:
+        raise PermissionError('Reading local files is disabled; set HUFFMAN_FILE_ROOT')
+    root = os.path.realpath(HUFFMAN_FILE_ROOT)
+    full = os.path.realpath(os.path.join(root, path))
+    if os.path.commonpath([root, full]) != root:
+        raise PermissionError(f'{path} is outside HUFFMAN_FILE_ROOT')
+    return full
+
+@app.route('/api/greedy/huffman/stream', methods=['POST'])
+def huffman_stream():
+    """Compress the raw body, or ?path= under HUFFMAN_FILE_ROOT, in two passes.
+
+    The response is the bit-packed stream, described by X-Huffman-* headers;
+    ?summary=1 returns the statistics as JSON instead.
+    """
+    source = None
+    try:
+        path = request.args.get('path')
+        summary = request.args.get('summary', '').lower() in ('1', 'true')
+        max_length = request.args.get('maxLength', type=int)
+        
+        start = time.perf_counter()
+        counts = [0] * 256
+        if path:
+            source = open(resolve_huffman_path(path), 'rb')
+            for chunk in read_chunks(source):
+                byte_frequencies(chunk, counts)
+        else:
+            source = tempfile.SpooledTemporaryFile(max_size=HUFFMAN_SPOOL_BYTES)
+            size = 0
+            for chunk in read_chunks(request.stream):
+                size += len(chunk)
+                if size > HUFFMAN_STREAM_MAX_BYTES:
+                    raise InputTooLarge(f'Uploads are limited to {HUFFMAN_STREAM_MAX_BYTES} bytes')
+                byte_frequencies(chunk, counts)
+                source.write(chunk)
+        count_seconds = time.perf_counter() - start
+        
+        size = sum(counts)
+        lengths = huffman_code_lengths(counts)
+        limited = max_length is not None and max(lengths) > max_length
+        if limited:
+            lengths = package_merge_lengths(counts, max_length)
+        # The counts fix the output size before a single bit is written
+        bits = sum(count * length for count, length in zip(counts, lengths))
+        compressed = (bits + 7) // 8
+        ratio = round(compressed / size, 4) if size else None
+        
+        source.seek(0)
+        encoder = HuffmanEncoder(lengths)
+        
+        def encode_chunks(source=source):
+            try:
+                for chunk in read_chunks(source):
+                    packed = encoder.encode(chunk)
+                    if packed:
+                        yield packed
+                tail = encoder.flush()
+                if tail:
+                    yield tail
+            finally:
+                source.close()
+        
+        if not summary:
+            # The generator now owns the source and closes it when the body is done
+            source = None
+            return Response(encode_chunks(), mimetype='application/octet-stream', headers={
+                'X-Huffman-Lengths': base64.b64encode(bytes(lengths)).decode('ascii'),
+                'X-Huffman-Symbols': str(size),
+                'X-Original-Bytes': str(size),
+                'X-Compressed-Bytes': str(compressed),
+                'X-Compression-Ratio': str(ratio)
+            })
+        
+        encode_start = time.perf_counter()
+        written = sum(len(packed) for packed in encode_chunks())
+        source = None
+        encode_seconds = time.perf_counter() - encode_start
+        return jsonify({
+            'source': 'file' if path else 'upload',
+            'lengths': lengths,
+            'symbols': size,
+            'bitLength': bits,
+            'originalBytes': size,
+            'compressedBytes': written,
+            'ratio': ratio,
+            'averageBits': round(bits / size, 4) if size else None,
+            'maxCodeLength': max(lengths),
+            'lengthLimited': limited,
+            'countMs': round(count_seconds * 1000, 3),
+            'encodeMs': round(encode_seconds * 1000, 3),
+            'throughputMBs': throughput(size, count_seconds + encode_seconds)
+        })
+    except InputTooLarge as e:
+        return jsonify({'error': str(e)}), 413
+    except PermissionError as e:
+        return jsonify({'error': str(e)}), 403
+    except FileNotFoundError:
+        return jsonify({'error': f'No such file: {request.args.get("path")}'}), 404
+    except Exception as e:
+        return jsonify({'error': str(e)}), 400
+    finally:
+        if source is not None:
+            source.close()
+
 # =================== MATHEMATICAL ALGORITHMS ===================
 # Extended Euclidean Algorithm
 @app.route('/api/math/extended-euclidean', methods=['POST'])
@@ -827,31 +3543,25 @@ def more_algorithms():
     try:
         data = request.json
         algo = data.get('algo')
-        a = data.get('a')
-        b = data.get('b')
-        pairs = data.get('pairs')
-        
-        if algo == 'extended-euclidean':
-            # Create a new request data for extended Euclidean
-            euclid_data = {
-                'a': int(a) if a else 0,
-                'b': int(b) if b else 0
-            }
-            return extended_euclidean_internal(euclid_data)
-            
-        elif algo == 'chinese-remainder':
-            # Create a new request data for Chinese Remainder
-            crt_data = {
-                'pairs': pairs if pairs else ""
-            }
-            return chinese_remainder_internal(crt_data)
-            
-        else:
-            return jsonify({'error': f'Unknown algorithm: {algo}'}), 400
-            
+        return lookup_algorithm('more', algo)['fn'](data)
     except Exception as e:
         return jsonify({'error': str(e)}), 400
 
+@register_algorithm('more', 'extended-euclidean', 'Extended Euclidean', 'O(log min(a, b))',
+                    args=('a', 'b'))
+def more_extended_euclidean(data):
+    a = data.get('a')
+    b = data.get('b')
+    return extended_euclidean_internal({
+        'a': int(a) if a else 0,
+        'b': int(b) if b else 0
+    })
+
+@register_algorithm('more', 'chinese-remainder', 'Chinese Remainder Theorem', 'O(k log M)',
+                    args=('pairs',), progress=True)
+def more_chinese_remainder(data, progress=None):
+    return chinese_remainder_internal({'pairs': data.get('pairs') or ""}, progress)
+
 # Internal versions of the algorithms for use by /api/more
 def extended_euclidean_internal(data):
     try:
@@ -931,7 +3641,7 @@ def extended_euclidean_internal(data):
     except Exception as e:
         return jsonify({'error': str(e)}), 400
 
-def chinese_remainder_internal(data):
+def chinese_remainder_internal(data, progress=None):
     try:
         pairs_str = data.get('pairs', '')
         
@@ -973,6 +3683,8 @@ def chinese_remainder_internal(data):
         steps.append("Step 3: Find multiplicative inverses yᵢ such that Mᵢ × yᵢ ≡ 1 (mod mᵢ)")
         y_i = []
         for i, ((a, m), M_i_val) in enumerate(zip(pairs, M_i)):
+            if progress:
+                progress(i, len(pairs))
             # Find inverse using extended Euclidean algorithm
             steps.append(f"")
             steps.append(f"Finding y_{i+1} such that {M_i_val} × y_{i+1} ≡ 1 (mod {m})")
@@ -1044,10 +3756,14 @@ def chinese_remainder_internal(data):
             'steps': steps
         })
         
+    except JobCancelled:
+        raise
     except Exception as e:
         return jsonify({'error': str(e)}), 400
 
 # =================== ENHANCED MATHEMATICAL OPERATIONS WITH DECIMAL SUPPORT ===================
+MATH_OPERATIONS = ('add', 'subtract', 'multiply', 'divide', 'modulo')
+
 @app.route('/api/math', methods=['POST'])
 def math_operations():
     try:
@@ -1362,11 +4078,8 @@ def handle_modulo_operation(num1_str, num2_str, base):
 
 
 # =================== CRYPTOGRAPHY ALGORITHMS ===================
-import hashlib
 import math
-import random
 from itertools import cycle
-import base64
 
 @app.route('/api/crypto', methods=['POST'])
 def crypto_operations():
@@ -1375,9 +4088,7 @@ def crypto_operations():
         print("Received crypto request:", data)
         
         algorithm = data.get('algorithm', 'caesar')
-        operation = data.get('operation', 'encrypt')
         input_text = data.get('input', '')
-        key = data.get('key', '')
         
         if not input_text:
             return jsonify({'error': 'Input text is required'}), 400
@@ -1385,41 +4096,10 @@ def crypto_operations():
         steps = []
         details = []
         
-        if algorithm == 'caesar':
-            result = caesar_cipher_crypto(input_text, key, operation, steps, details)
-        elif algorithm == 'playfair':
-            result = playfair_cipher_crypto(input_text, key, operation, steps, details)
-        elif algorithm == 'vigenere':
-            result = vigenere_cipher_crypto(input_text, key, operation, steps, details)
-        elif algorithm == 'affine':
-            result = affine_cipher_crypto(input_text, key, operation, steps, details)
-        elif algorithm == 'railfence':
-            result = rail_fence_cipher_crypto(input_text, key, operation, steps, details)
-        elif algorithm == 'columnar':
-            result = columnar_transposition_crypto(input_text, key, operation, steps, details)
-        elif algorithm == 'substitution':
-            result = substitution_cipher_crypto(input_text, key, operation, steps, details)
-        elif algorithm == 'transposition':
-            result = transposition_cipher_crypto(input_text, key, operation, steps, details)
-        elif algorithm == 'sha256':
-            result = sha256_hash_crypto(input_text, steps, details)
-        elif algorithm == 'scytale':
-            result = scytale_cipher_crypto(input_text, key, operation, steps, details)
-        elif algorithm == 'hill':
-            hill_size = int(data.get('hillSize', 2))
-            result = hill_cipher_crypto(input_text, key, hill_size, operation, steps, details)
-        elif algorithm == 'monoalphabetic':
-            result = monoalphabetic_cipher_crypto(input_text, key, operation, steps, details)
-        elif algorithm == 'polyalphabetic':
-            result = polyalphabetic_cipher_crypto(input_text, key, operation, steps, details)
-        elif algorithm == 'product':
-            result = product_cipher_crypto(input_text, key, operation, steps, details)
-        elif algorithm == 'spn':
-            result = spn_cipher_crypto(input_text, key, operation, steps, details)
-        elif algorithm == 'kasiski':
-            result = kasiski_examination_crypto(input_text, key, steps, details)
-        else:
-            return jsonify({'error': f'Unknown algorithm: {algorithm}'}), 400
+        descriptor = lookup_algorithm('crypto', algorithm)
+        check_input_size(descriptor, algorithm, len(input_text))
+        
+        result = run_cipher(descriptor, data, steps, details)
         
         return jsonify({
             'result': result,
@@ -1427,12 +4107,31 @@ def crypto_operations():
             'details': details
         })
         
+    except InputTooLarge as e:
+        return jsonify({'error': str(e)}), 413
     except Exception as e:
         print(f"Crypto error: {str(e)}")
         return jsonify({'error': str(e)}), 400
 
+# Ciphers report job progress once per this many characters (or blocks)
+CIPHER_PROGRESS_CHUNK = 4096
+
+def run_cipher(descriptor, data, steps, details, progress=None):
+    """Call a registered cipher with the request fields its descriptor names"""
+    arguments = {
+        'input': data.get('input', ''),
+        'key': data.get('key', ''),
+        'operation': data.get('operation', 'encrypt')
+    }
+    if 'hillSize' in descriptor['args']:
+        arguments['hillSize'] = int(data.get('hillSize', 2))
+    kwargs = {'progress': progress} if progress is not None and descriptor['reportsProgress'] else {}
+    return descriptor['fn'](*(arguments[field] for field in descriptor['args']), steps, details, **kwargs)
+
 # Caesar Cipher
-def caesar_cipher_crypto(text, key, operation, steps, details):
+@register_algorithm('crypto', 'caesar', 'Caesar Cipher', 'O(n)', max_n=CIPHER_MAX_N,
+                    job_max_n=JOB_CIPHER_MAX_N, args=('input', 'key', 'operation'), progress=True)
+def caesar_cipher_crypto(text, key, operation, steps, details, progress=None):
     try:
         shift = int(key) if key else 3
     except:
@@ -1445,6 +4144,8 @@ def caesar_cipher_crypto(text, key, operation, steps, details):
     
     result = ""
     for i, char in enumerate(text):
+        if progress and i % CIPHER_PROGRESS_CHUNK == 0:
+            progress(i, len(text))
         if char.isalpha():
             base = ord('A') if char.isupper() else ord('a')
             char_pos = ord(char) - base
@@ -1468,7 +4169,9 @@ def caesar_cipher_crypto(text, key, operation, steps, details):
     return result
 
 # Playfair Cipher
-def playfair_cipher_crypto(text, key, operation, steps, details):
+@register_algorithm('crypto', 'playfair', 'Playfair Cipher', 'O(n)', max_n=CIPHER_MAX_N,
+                    job_max_n=JOB_CIPHER_MAX_N, args=('input', 'key', 'operation'), progress=True)
+def playfair_cipher_crypto(text, key, operation, steps, details, progress=None):
     steps.append(f"=== PLAYFAIR CIPHER {operation.upper()} ===")
     steps.append(f"Input text: '{text}'")
     steps.append(f"Key: '{key}'")
@@ -1504,7 +4207,9 @@ def playfair_cipher_crypto(text, key, operation, steps, details):
     steps.append("")
     
     result = ""
-    for digraph in digraphs:
+    for i, digraph in enumerate(digraphs):
+        if progress and i % CIPHER_PROGRESS_CHUNK == 0:
+            progress(i, len(digraphs))
         a, b = digraph[0], digraph[1]
         
         if a == b:
@@ -1562,7 +4267,9 @@ def playfair_cipher_crypto(text, key, operation, steps, details):
     return result
 
 # Vigenère Cipher
-def vigenere_cipher_crypto(text, key, operation, steps, details):
+@register_algorithm('crypto', 'vigenere', 'Vigenère Cipher', 'O(n)', max_n=CIPHER_MAX_N,
+                    job_max_n=JOB_CIPHER_MAX_N, args=('input', 'key', 'operation'), progress=True)
+def vigenere_cipher_crypto(text, key, operation, steps, details, progress=None):
     steps.append(f"=== VIGENÈRE CIPHER {operation.upper()} ===")
     steps.append(f"Input text: '{text}'")
     steps.append(f"Key: '{key}'")
@@ -1574,6 +4281,8 @@ def vigenere_cipher_crypto(text, key, operation, steps, details):
     
     steps.append("Processing each character:")
     for i, char in enumerate(text):
+        if progress and i % CIPHER_PROGRESS_CHUNK == 0:
+            progress(i, len(text))
         if char.isalpha():
             base = ord('A') if char.isupper() else ord('a')
             key_char = key[key_index % len(key)]
@@ -1602,7 +4311,9 @@ def vigenere_cipher_crypto(text, key, operation, steps, details):
     return result
 
 # Affine Cipher
-def affine_cipher_crypto(text, key, operation, steps, details):
+@register_algorithm('crypto', 'affine', 'Affine Cipher', 'O(n)', max_n=CIPHER_MAX_N,
+                    job_max_n=JOB_CIPHER_MAX_N, args=('input', 'key', 'operation'), progress=True)
+def affine_cipher_crypto(text, key, operation, steps, details, progress=None):
     steps.append(f"=== AFFINE CIPHER {operation.upper()} ===")
     steps.append(f"Input text: '{text}'")
     steps.append(f"Key: '{key}'")
@@ -1633,6 +4344,8 @@ def affine_cipher_crypto(text, key, operation, steps, details):
     
     result = ""
     for i, char in enumerate(text):
+        if progress and i % CIPHER_PROGRESS_CHUNK == 0:
+            progress(i, len(text))
         if char.isalpha():
             base = ord('A') if char.isupper() else ord('a')
             x = ord(char) - base
@@ -1656,7 +4369,9 @@ def affine_cipher_crypto(text, key, operation, steps, details):
     return result
 
 # Rail Fence Cipher
-def rail_fence_cipher_crypto(text, key, operation, steps, details):
+@register_algorithm('crypto', 'railfence', 'Rail Fence Cipher', 'O(n)', max_n=CIPHER_MAX_N,
+                    job_max_n=JOB_CIPHER_MAX_N, args=('input', 'key', 'operation'), progress=True)
+def rail_fence_cipher_crypto(text, key, operation, steps, details, progress=None):
     steps.append(f"=== RAIL FENCE CIPHER {operation.upper()} ===")
     steps.append(f"Input text: '{text}'")
     
@@ -1675,6 +4390,8 @@ def rail_fence_cipher_crypto(text, key, operation, steps, details):
         
         steps.append("Writing text in zigzag pattern:")
         for i, char in enumerate(text):
+            if progress and i % CIPHER_PROGRESS_CHUNK == 0:
+                progress(i, len(text))
             fence[rail].append(char)
             steps.append(f"  Position {i}: '{char}' placed on rail {rail}")
             
@@ -1717,7 +4434,9 @@ def rail_fence_cipher_crypto(text, key, operation, steps, details):
         
         result = ""
         rail_positions = [0] * rails
-        for target_rail in pattern:
+        for i, target_rail in enumerate(pattern):
+            if progress and i % CIPHER_PROGRESS_CHUNK == 0:
+                progress(i, len(pattern))
             result += rails_text[target_rail][rail_positions[target_rail]]
             rail_positions[target_rail] += 1
             steps.append(f"  Reading from rail {target_rail}: '{result[-1]}' → '{result}'")
@@ -1729,7 +4448,9 @@ def rail_fence_cipher_crypto(text, key, operation, steps, details):
     return result
 
 # Columnar Transposition
-def columnar_transposition_crypto(text, key, operation, steps, details):
+@register_algorithm('crypto', 'columnar', 'Columnar Transposition', 'O(n)', max_n=CIPHER_MAX_N,
+                    job_max_n=JOB_CIPHER_MAX_N, args=('input', 'key', 'operation'), progress=True)
+def columnar_transposition_crypto(text, key, operation, steps, details, progress=None):
     steps.append(f"=== COLUMNAR TRANSPOSITION {operation.upper()} ===")
     steps.append(f"Input text: '{text}'")
     steps.append(f"Key: '{key}'")
@@ -1766,7 +4487,9 @@ def columnar_transposition_crypto(text, key, operation, steps, details):
         steps.append("")
         steps.append("Reading columns in key order:")
         result = ""
-        for order in sorted(range(cols), key=lambda x: key_order[x]):
+        for done, order in enumerate(sorted(range(cols), key=lambda x: key_order[x])):
+            if progress:
+                progress(done, cols)
             column = ''.join(grid[row][order] for row in range(rows))
             result += column
             steps.append(f"  Column {order+1} (key '{key[order]}'): '{column}'")
@@ -1791,6 +4514,8 @@ def columnar_transposition_crypto(text, key, operation, steps, details):
         
         result = ""
         for row in range(rows):
+            if progress and row % CIPHER_PROGRESS_CHUNK == 0:
+                progress(row, rows)
             row_text = ""
             for col in range(cols):
                 if row < len(columns[col]):
@@ -1805,7 +4530,9 @@ def columnar_transposition_crypto(text, key, operation, steps, details):
     return result
 
 # Substitution Cipher
-def substitution_cipher_crypto(text, key, operation, steps, details):
+@register_algorithm('crypto', 'substitution', 'Substitution Cipher', 'O(n)', max_n=CIPHER_MAX_N,
+                    job_max_n=JOB_CIPHER_MAX_N, args=('input', 'key', 'operation'), progress=True)
+def substitution_cipher_crypto(text, key, operation, steps, details, progress=None):
     steps.append(f"=== SUBSTITUTION CIPHER {operation.upper()} ===")
     steps.append(f"Input text: '{text}'")
     
@@ -1841,7 +4568,9 @@ def substitution_cipher_crypto(text, key, operation, steps, details):
     steps.append("Processing text:")
     
     result = ""
-    for char in text.upper():
+    for i, char in enumerate(text.upper()):
+        if progress and i % CIPHER_PROGRESS_CHUNK == 0:
+            progress(i, len(text))
         if char in substitution:
             result += substitution[char]
             steps.append(f"  '{char}' → '{substitution[char]}'")
@@ -1855,11 +4584,15 @@ def substitution_cipher_crypto(text, key, operation, steps, details):
     return result
 
 # Transposition Cipher
-def transposition_cipher_crypto(text, key, operation, steps, details):
-    return columnar_transposition_crypto(text, key, operation, steps, details)
+@register_algorithm('crypto', 'transposition', 'Transposition Cipher', 'O(n)', max_n=CIPHER_MAX_N,
+                    job_max_n=JOB_CIPHER_MAX_N, args=('input', 'key', 'operation'), progress=True)
+def transposition_cipher_crypto(text, key, operation, steps, details, progress=None):
+    return columnar_transposition_crypto(text, key, operation, steps, details, progress)
 
 # SHA-256 Hash
-def sha256_hash_crypto(text, steps, details):
+@register_algorithm('crypto', 'sha256', 'SHA-256 Hash', 'O(n)', max_n=CIPHER_MAX_N,
+                    job_max_n=JOB_CIPHER_MAX_N, args=('input',), progress=True)
+def sha256_hash_crypto(text, steps, details, progress=None):
     steps.append("=== SHA-256 HASH ===")
     steps.append(f"Input text: '{text}'")
     steps.append("")
@@ -1869,7 +4602,11 @@ def sha256_hash_crypto(text, steps, details):
     steps.append(f"Byte length: {len(text_bytes)} bytes")
     steps.append("")
     
-    hash_obj = hashlib.sha256(text_bytes)
+    hash_obj = hashlib.sha256()
+    for start in range(0, len(text_bytes), CIPHER_PROGRESS_CHUNK):
+        if progress:
+            progress(start, len(text_bytes))
+        hash_obj.update(text_bytes[start:start + CIPHER_PROGRESS_CHUNK])
     hash_hex = hash_obj.hexdigest()
     
     steps.append("SHA-256 computation steps:")
@@ -1889,7 +4626,9 @@ def sha256_hash_crypto(text, steps, details):
     return hash_hex
 
 # Scytale Cipher
-def scytale_cipher_crypto(text, key, operation, steps, details):
+@register_algorithm('crypto', 'scytale', 'Scytale Cipher', 'O(n)', max_n=CIPHER_MAX_N,
+                    job_max_n=JOB_CIPHER_MAX_N, args=('input', 'key', 'operation'), progress=True)
+def scytale_cipher_crypto(text, key, operation, steps, details, progress=None):
     steps.append(f"=== SCYTALE CIPHER {operation.upper()} ===")
     steps.append(f"Input text: '{text}'")
     
@@ -1905,6 +4644,8 @@ def scytale_cipher_crypto(text, key, operation, steps, details):
         steps.append("Wrapping text around cylinder and reading horizontally:")
         result = ""
         for i in range(diameter):
+            if progress and i % CIPHER_PROGRESS_CHUNK == 0:
+                progress(i, diameter)
             column = text[i::diameter]
             result += column
             steps.append(f"  Column {i+1}: '{column}'")
@@ -1915,6 +4656,8 @@ def scytale_cipher_crypto(text, key, operation, steps, details):
         rows = math.ceil(len(text) / diameter)
         result = ""
         for i in range(rows):
+            if progress and i % CIPHER_PROGRESS_CHUNK == 0:
+                progress(i, rows)
             row_chars = text[i::rows]
             result += row_chars
             steps.append(f"  Row {i+1}: '{row_chars}' → '{result}'")
@@ -1926,7 +4669,9 @@ def scytale_cipher_crypto(text, key, operation, steps, details):
     return result
 
 # Hill Cipher
-def hill_cipher_crypto(text, key, size, operation, steps, details):
+@register_algorithm('crypto', 'hill', 'Hill Cipher', 'O(n)', max_n=CIPHER_MAX_N,
+                    job_max_n=JOB_CIPHER_MAX_N, args=('input', 'key', 'hillSize', 'operation'), progress=True)
+def hill_cipher_crypto(text, key, size, operation, steps, details, progress=None):
     try:
         size = int(size)
         key_matrix = list(map(int, key.split(',')))
@@ -1951,6 +4696,8 @@ def hill_cipher_crypto(text, key, size, operation, steps, details):
     
     result_numbers = []
     for i in range(0, len(text_numbers), size):
+        if progress and i // size % CIPHER_PROGRESS_CHUNK == 0:
+            progress(i, len(text_numbers))
         block = text_numbers[i:i+size]
         steps.append(f"Processing block: {block}")
         
@@ -1987,28 +4734,42 @@ def hill_cipher_crypto(text, key, size, operation, steps, details):
     return result
 
 # Monoalphabetic Cipher
-def monoalphabetic_cipher_crypto(text, key, operation, steps, details):
-    return substitution_cipher_crypto(text, key, operation, steps, details)
+@register_algorithm('crypto', 'monoalphabetic', 'Monoalphabetic Cipher', 'O(n)', max_n=CIPHER_MAX_N,
+                    job_max_n=JOB_CIPHER_MAX_N, args=('input', 'key', 'operation'), progress=True)
+def monoalphabetic_cipher_crypto(text, key, operation, steps, details, progress=None):
+    return substitution_cipher_crypto(text, key, operation, steps, details, progress)
 
 # Polyalphabetic Cipher
-def polyalphabetic_cipher_crypto(text, key, operation, steps, details):
-    return vigenere_cipher_crypto(text, key, operation, steps, details)
+@register_algorithm('crypto', 'polyalphabetic', 'Polyalphabetic Cipher', 'O(n)', max_n=CIPHER_MAX_N,
+                    job_max_n=JOB_CIPHER_MAX_N, args=('input', 'key', 'operation'), progress=True)
+def polyalphabetic_cipher_crypto(text, key, operation, steps, details, progress=None):
+    return vigenere_cipher_crypto(text, key, operation, steps, details, progress)
 
 # Product Cipher
-def product_cipher_crypto(text, key, operation, steps, details):
+@register_algorithm('crypto', 'product', 'Product Cipher', 'O(n)', max_n=CIPHER_MAX_N,
+                    job_max_n=JOB_CIPHER_MAX_N, args=('input', 'key', 'operation'), progress=True)
+def product_cipher_crypto(text, key, operation, steps, details, progress=None):
     steps.append("=== PRODUCT CIPHER ===")
     steps.append("Applying substitution then transposition")
     
-    sub_result = substitution_cipher_crypto(text, key, operation, [], [])
+    # Both stages report on one scale, so the job's percentage only rises
+    stage_progress = None
+    if progress:
+        stage_progress = lambda done, total: progress(done, 2 * total)
+    sub_result = substitution_cipher_crypto(text, key, operation, [], [], stage_progress)
     steps.append(f"After substitution: {sub_result}")
     
-    result = columnar_transposition_crypto(sub_result, key, operation, [], [])
+    if progress:
+        stage_progress = lambda done, total: progress(total + done, 2 * total)
+    result = columnar_transposition_crypto(sub_result, key, operation, [], [], stage_progress)
     steps.append(f"After transposition: {result}")
     
     return result
 
 # Substitution-Permutation Network
-def spn_cipher_crypto(text, key, operation, steps, details):
+@register_algorithm('crypto', 'spn', 'Substitution-Permutation Network', 'O(n)', max_n=CIPHER_MAX_N,
+                    job_max_n=JOB_CIPHER_MAX_N, args=('input', 'key', 'operation'), progress=True)
+def spn_cipher_crypto(text, key, operation, steps, details, progress=None):
     steps.append("=== SUBSTITUTION-PERMUTATION NETWORK ===")
     steps.append("Multiple rounds of substitution and permutation")
     
@@ -2016,8 +4777,11 @@ def spn_cipher_crypto(text, key, operation, steps, details):
     rounds = 4
     
     for round_num in range(rounds):
+        round_progress = None
+        if progress:
+            round_progress = lambda done, total, r=round_num: progress(r * total + done, rounds * total)
         sub_key = key + str(round_num)
-        result = substitution_cipher_crypto(result, sub_key, operation, [], [])
+        result = substitution_cipher_crypto(result, sub_key, operation, [], [], round_progress)
         steps.append(f"Round {round_num+1} substitution: {result}")
         
         if len(result) > 1:
@@ -2027,7 +4791,9 @@ def spn_cipher_crypto(text, key, operation, steps, details):
     return result
 
 # Kasiski Examination
-def kasiski_examination_crypto(text, key, steps, details):
+@register_algorithm('crypto', 'kasiski', 'Kasiski Examination', 'O(n^2)', max_n=QUADRATIC_MAX_N,
+                    job_max_n=JOB_KASISKI_MAX_N, args=('input', 'key'), progress=True)
+def kasiski_examination_crypto(text, key, steps, details, progress=None):
     steps.append("=== KASISKI EXAMINATION ===")
     steps.append("Finding repeated sequences to determine key length")
     
@@ -2035,6 +4801,8 @@ def kasiski_examination_crypto(text, key, steps, details):
     sequences = {}
     
     for length in range(3, 6):
+        if progress:
+            progress(length - 3, None)
         for i in range(len(text) - length + 1):
             seq = text[i:i+length]
             if seq in sequences:
@@ -2046,7 +4814,9 @@ def kasiski_examination_crypto(text, key, steps, details):
     steps.append(f"Repeated sequences found: {len(repeated_seqs)}")
     
     distances = []
-    for seq, positions in repeated_seqs.items():
+    for done, (seq, positions) in enumerate(repeated_seqs.items()):
+        if progress:
+            progress(done, len(repeated_seqs))
         steps.append(f"Sequence '{seq}' at positions: {positions}")
         for i in range(len(positions)):
             for j in range(i+1, len(positions)):